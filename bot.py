@@ -21,6 +21,11 @@ from telegram.ext import (
 )
 from telegram.constants import ChatAction
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 from github_service import GitHubService
 from database import Database
 
@@ -1210,7 +1215,7 @@ async def handle_commit_input(update: Update, context: ContextTypes.DEFAULT_TYPE
                 commit_details += f"{signature_status}\n\n"
                 
                 # Verification checks
-                checks = await github_service.verify_commit(commit_info)
+                checks = github_service.verify_commit(commit_info)
                 commit_details += "*✓ Результаты проверки:*\n"
                 for check_name, check_result in checks.items():
                     status = "✅" if check_result else "❌"
@@ -1302,6 +1307,11 @@ def main() -> None:
     if not telegram_token:
         raise ValueError("TELEGRAM_BOT_TOKEN not found in environment variables")
     
+    # Faster event loop for the GitHub/Ollama network fan-outs (optional)
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        logger.info("Using uvloop event loop")
+    
     # Create application
     application = Application.builder().token(telegram_token).build()
     
@@ -6,59 +6,679 @@ GitHub API Service
 
 import logging
 import json
-from typing import Dict, Optional, List, Any, Tuple
+import os
+import re
+import sqlite3
+import zlib
+from typing import AsyncIterator, Dict, Optional, List, Any, Tuple
 from datetime import datetime
 import asyncio
+import codecs
+import hashlib
+import itertools
+import math
+import time
+from collections import OrderedDict
+from contextlib import closing
+from dataclasses import dataclass
 
 import aiohttp
 from aiohttp import ClientSession, ClientResponseError
 
+from utils import RepositoryParser
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # aiohttp decodes brotli transparently when the module is installed
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    _ACCEPT_ENCODING = "gzip, deflate"
+
 logger = logging.getLogger(__name__)
 
 
+def _json_loads(data: bytes) -> Any:
+    """Decode JSON with orjson when available, stdlib json otherwise."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Encode JSON to bytes with orjson when available, stdlib json otherwise."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+_REPO_OVERVIEW_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) {
+    nameWithOwner
+    url
+    description
+    stargazerCount
+    primaryLanguage { name }
+    defaultBranchRef {
+      name
+      target { ... on Commit { oid author { date } } }
+    }
+    refs(refPrefix: "refs/heads/", first: 100) { nodes { name } }
+  }
+}
+"""
+
+_COMMIT_FIELDS_FRAGMENT = """
+fragment CommitFields on Commit {
+  oid
+  message
+  url
+  author { name email date }
+  signature { isValid }
+}
+"""
+
+# Commit history analysis prompts, formatted with repo_path and commits_text
+_PROMPT_TEMPLATES: Dict[str, str] = {
+    "summary": """Analyze these commits from repository {repo_path}:
+
+{commits_text}
+
+Provide a brief summary of the development progress and key changes.""",
+
+    "quality": """Analyze code quality based on these commit messages from {repo_path}:
+
+{commits_text}
+
+Assess commit quality, message clarity, and development practices.""",
+
+    "security": """Analyze security-related commits from {repo_path}:
+
+{commits_text}
+
+Identify any security fixes, vulnerability patches, or security-related changes.""",
+
+    "patterns": """Analyze development patterns from these commits in {repo_path}:
+
+{commits_text}
+
+Identify development patterns, release cycles, and work patterns.""",
+}
+
+# Per-file fields exposed by get_commit_files ('patch' is absent for binaries)
+_FILE_KEYS = ('filename', 'status', 'additions', 'deletions', 'changes', 'patch')
+
+_FULL_SHA_RE = re.compile(r'[0-9a-fA-F]{40}')
+
+
+_ISO_RE = re.compile(
+    r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})'
+)
+
+
+def _format_github_date(date_str: str) -> str:
+    """
+    Format an ISO-8601 timestamp from the GitHub API as 'YYYY-MM-DD HH:MM:SS'.
+
+    GitHub emits a fixed layout, so well-formed values are sliced directly;
+    anything else goes through datetime parsing.
+    """
+    # REST timestamps are always the 20-char 'YYYY-MM-DDTHH:MM:SSZ' shape
+    if len(date_str) == 20 and date_str[10] == 'T' and date_str[19] == 'Z':
+        return f"{date_str[:10]} {date_str[11:19]}"
+    if _ISO_RE.fullmatch(date_str) is not None:
+        return f"{date_str[:10]} {date_str[11:19]}"
+    dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+    return dt.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _commit_checks(verified: bool, author_email: str, message: str) -> Dict[str, bool]:
+    """Basic commit verification checks (placeholder for actual verification logic)."""
+    return {
+        "GPG Signature": verified,
+        "Valid Author Email": "@users.noreply.github.com" not in author_email,
+        "Message Length": len(message) > 10,
+    }
+
+
+class _Record:
+    """Mixin giving slotted dataclasses read-only dict-style access.
+
+    List endpoints return one record per item; slots keep them small while
+    ``record['key']`` / ``record.get('key')`` keep existing callers working.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+
+@dataclass(frozen=True, slots=True)
+class RepoSummary(_Record):
+    """Repository entry returned by get_user_repositories."""
+    full_name: str
+    name: str
+    url: str
+    description: Optional[str]
+    stargazers_count: int
+    language: Optional[str]
+    private: bool
+    html_url: str
+
+
+@dataclass(frozen=True, slots=True)
+class CommitSummary(_Record):
+    """Commit entry returned by get_commit_history."""
+    sha: str
+    short_sha: str
+    message: str
+    author: str
+    author_email: str
+    date: str
+    url: str
+
+
+def _is_full_sha(ref: str) -> bool:
+    """Full SHAs address immutable commits; branch names and short SHAs may move."""
+    return _FULL_SHA_RE.fullmatch(ref) is not None
+
+
+class ETagStore:
+    """
+    SQLite-backed store of GitHub responses and their ETags.
+
+    Survives process restarts, so conditional requests (If-None-Match) can
+    be sent on the first call after a restart. Bodies are stored as
+    zlib-compressed JSON.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Initialize the store
+        
+        Args:
+            path: SQLite database file (created if missing)
+        """
+        self.path = path
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, etag TEXT, body BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+    
+    def get(self, key: str) -> Optional[Tuple[Optional[str], Any]]:
+        """Return (etag, payload) for a key, or None if missing or expired."""
+        with closing(sqlite3.connect(self.path)) as conn:
+            row = conn.execute(
+                "SELECT etag, body, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[2] < time.time():
+            return None
+        return row[0], _json_loads(zlib.decompress(row[1]))
+    
+    def set(self, key: str, etag: Optional[str], payload: Any, ttl: float) -> None:
+        """Store a payload with its ETag for ttl seconds."""
+        body = zlib.compress(_json_dumps(payload))
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, etag, body, expires_at) VALUES (?, ?, ?, ?)",
+                (key, etag, body, time.time() + ttl),
+            )
+
+
 class GitHubService:
     """
     Service for GitHub API interactions
     """
     
-    def __init__(self, token: str, ollama_host: Optional[str] = None):
+    # Retry policy for transient failures (5xx, network errors, rate limits)
+    MAX_RETRIES = 3
+    RETRY_BACKOFF = 1.0
+    MAX_RETRY_DELAY = 60.0
+    # Only these are retried after a 5xx or network error: a POST/PATCH may
+    # have been applied even though its response was lost
+    IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+    
+    # Concurrency and primary rate-limit handling
+    MAX_CONCURRENT_REQUESTS = 20
+    RATE_LIMIT_LOW_WATERMARK = 10
+    
+    # Response cache for GET requests
+    CACHE_TTL = 60
+    CACHE_MAX_ENTRIES = 1024
+    
+    # Persistent (on-disk) cache retention
+    DISK_CACHE_TTL = 300
+    DISK_CACHE_TTL_IMMUTABLE = 86400
+    
+    # Connection pool shared by every GitHubService in the process (e.g. one
+    # per user token). aiohttp speaks HTTP/1.1 only, so instead of HTTP/2
+    # multiplexing each admitted request gets a warm keep-alive connection;
+    # the per-host limit leaves headroom above one instance's semaphore.
+    POOL_LIMIT = 100
+    POOL_LIMIT_PER_HOST = 30
+    POOL_KEEPALIVE_TIMEOUT = 75
+    _shared_connector: Optional[aiohttp.TCPConnector] = None
+    _shared_connector_users = 0
+    
+    # Chunk size for streamed (diff) responses
+    STREAM_CHUNK_SIZE = 65536
+    
+    def __init__(
+        self,
+        token: str,
+        ollama_host: Optional[str] = None,
+        cache_path: Optional[str] = None
+    ):
         """
         Initialize GitHub service
         
         Args:
             token: GitHub personal access token
             ollama_host: Ollama API endpoint (optional)
+            cache_path: SQLite file for the persistent response cache
+                        (defaults to GITHUB_CACHE_PATH; disabled if unset)
         """
         self.token = token
         self.api_url = "https://api.github.com"
         self.ollama_host = ollama_host or "http://localhost:11434"
+        self._ollama_url = f"{self.ollama_host}/api/generate"
         self.headers = {
             "Authorization": f"token {token}",
             "Accept": "application/vnd.github.v3+json",
+            "Accept-Encoding": _ACCEPT_ENCODING,
         }
         self.session: Optional[ClientSession] = None
+        # Serialises session creation/teardown across concurrent callers
+        self._session_lock = asyncio.Lock()
+        # cache key -> (expires_at, etag, payload)
+        self._cache: "OrderedDict[str, Tuple[float, Optional[str], Any]]" = OrderedDict()
+        # cache key -> in-flight request shared by concurrent callers
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # cache key -> number of callers awaiting the in-flight request
+        self._inflight_waiters: Dict[str, int] = {}
+        # Bounds concurrent GitHub requests (fan-outs, parallel users)
+        self._semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        # Primary rate-limit budget: requests left (None until the first
+        # response) and epoch time at which the window resets
+        self._rate_limit_remaining: Optional[int] = None
+        self._rate_limit_reset = 0.0
+        # Epoch time until which all requests hold after a Retry-After
+        self._rate_limit_pause_until = 0.0
+        
+        cache_path = cache_path or os.getenv('GITHUB_CACHE_PATH')
+        # Persistent entries are scoped to the token that fetched them, so a
+        # shared cache file never serves one token's (private) data to another
+        self._disk_key_prefix = hashlib.sha256(token.encode('utf-8')).hexdigest()[:32] + ':'
+        self._disk_cache: Optional[ETagStore] = None
+        if cache_path:
+            try:
+                self._disk_cache = ETagStore(cache_path)
+            except sqlite3.Error as e:
+                logger.warning("Persistent GitHub cache disabled (%s): %s", cache_path, e)
         
+    @classmethod
+    def _acquire_connector(cls) -> aiohttp.TCPConnector:
+        """Get the process-wide connector, creating it on first use."""
+        if cls._shared_connector is None or cls._shared_connector.closed:
+            cls._shared_connector = aiohttp.TCPConnector(
+                limit=cls.POOL_LIMIT,
+                limit_per_host=cls.POOL_LIMIT_PER_HOST,
+                ttl_dns_cache=300,
+                keepalive_timeout=cls.POOL_KEEPALIVE_TIMEOUT,
+            )
+            cls._shared_connector_users = 0
+        cls._shared_connector_users += 1
+        return cls._shared_connector
+
+    @classmethod
+    async def _release_connector(cls) -> None:
+        """Close the shared connector once its last session is closed."""
+        cls._shared_connector_users -= 1
+        if cls._shared_connector_users <= 0 and cls._shared_connector is not None:
+            await cls._shared_connector.close()
+            cls._shared_connector = None
+            cls._shared_connector_users = 0
+
     async def init_session(self):
         """Initialize aiohttp client session."""
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession(headers=self.headers)
+        if self.session is not None and not self.session.closed:
+            return
+        async with self._session_lock:
+            if self.session is None or self.session.closed:
+                self.session = aiohttp.ClientSession(
+                    headers=self.headers,
+                    connector=self._acquire_connector(),
+                    connector_owner=False,
+                    timeout=aiohttp.ClientTimeout(total=10),
+                )
 
     async def close_session(self):
         """Close aiohttp client session."""
-        if self.session and not self.session.closed:
-            await self.session.close()
-            self.session = None
-
-    def _parse_repo_path(self, repo_path: str) -> Tuple[str, str]:
-        """Helper to parse repository path from URL or owner/repo format."""
-        if repo_path.startswith('http'):
-            # Extract from URL
-            parts = repo_path.rstrip('/').split('/')
-            owner, repo = parts[-2], parts[-1]
-        else:
-            # Direct format
-            owner, repo = repo_path.split('/')
-        return owner, repo
+        async with self._session_lock:
+            if self.session and not self.session.closed:
+                session, self.session = self.session, None
+                await session.close()
+                await self._release_connector()
+
+    async def __aenter__(self) -> "GitHubService":
+        await self.init_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close_session()
+
+    @staticmethod
+    def _parse_repo(repo_path: str) -> Optional[Tuple[str, str]]:
+        """
+        Parse repository path from URL or owner/repo format.
+
+        Returns None (logged once here) for malformed paths, so API methods
+        can reject them up front without wrapping their bodies in try/except.
+        """
+        try:
+            # Same rules (and parse cache) as the bot's input validation
+            return RepositoryParser.parse_repo_path(repo_path)
+        except ValueError as e:
+            logger.debug("Rejected repository path: %s", e)
+            return None
+
+    def _record_rate_limit(self, response: aiohttp.ClientResponse) -> None:
+        """
+        Refill the local request budget from X-RateLimit-* headers.
+
+        Only the REST "core" budget is tracked; GraphQL, search etc. have
+        separate budgets (X-RateLimit-Resource) that must not overwrite it.
+        """
+        if response.headers.get('X-RateLimit-Resource', 'core') != 'core':
+            return
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset = response.headers.get('X-RateLimit-Reset')
+        if remaining is None or reset is None:
+            return
+        try:
+            self._rate_limit_remaining = int(remaining)
+            self._rate_limit_reset = float(reset)
+        except ValueError:
+            pass
+
+    async def _wait_for_rate_limit(self) -> None:
+        """
+        Take one request from the rate-limit budget, waiting if necessary.
+
+        The budget is decremented locally for every request sent, so a burst
+        of concurrent requests stops at the low watermark instead of running
+        into 403s before their responses update the headers. Requests also
+        hold while a Retry-After pause is in effect.
+        """
+        now = time.time()
+        delay = 0.0
+        if self._rate_limit_pause_until > now:
+            delay = self._rate_limit_pause_until - now
+        elif (
+            self._rate_limit_remaining is not None
+            and self._rate_limit_remaining < self.RATE_LIMIT_LOW_WATERMARK
+            and self._rate_limit_reset > now
+        ):
+            delay = self._rate_limit_reset - now
+        
+        # Too long to stall the bot; spend the remaining budget instead
+        if 0 < delay <= self.MAX_RETRY_DELAY:
+            logger.warning("GitHub rate limit nearly exhausted, pausing %.1fs", delay)
+            await asyncio.sleep(delay)
+        if self._rate_limit_remaining is not None:
+            self._rate_limit_remaining -= 1
+
+    def _rate_limit_delay(self, response: aiohttp.ClientResponse) -> Optional[float]:
+        """
+        Seconds to wait before retrying a 403/429 response.
+
+        Returns None when the response is not a rate-limit rejection
+        (e.g. a plain permission error).
+        """
+        retry_after = response.headers.get('Retry-After')
+        if retry_after is not None:
+            try:
+                return float(retry_after)
+            except ValueError:
+                return None
+        if response.headers.get('X-RateLimit-Remaining') == '0':
+            reset = response.headers.get('X-RateLimit-Reset')
+            if reset is not None:
+                try:
+                    return max(0.0, float(reset) - time.time())
+                except ValueError:
+                    return None
+        return None
+
+    async def _send(
+        self,
+        url: str,
+        method: str = 'GET',
+        params: Optional[Dict] = None,
+        json_data: Optional[Dict] = None,
+        headers: Optional[Dict[str, str]] = None,
+        as_text: bool = False,
+    ) -> Tuple[Optional[int], Optional[str], Any]:
+        """
+        Send a GitHub API request with explicit status dispatch.
+
+        Returns (status, etag, body); status is None when the request failed.
+
+        - 2xx: decoded body is returned
+        - 304: no body (conditional request, cached copy is still valid)
+        - 404: no body (resource legitimately not found)
+        - 403/429 with rate-limit headers: wait and retry (the request was
+          rejected, so this is safe for writes too)
+        - 5xx, network errors, timeouts: exponential backoff and retry for
+          idempotent methods; None for writes (POST, PATCH)
+        - other 4xx: None, logged as an error
+        """
+        await self.init_session()
+        # Encode the body once to bytes, outside the retry loop
+        body = None
+        if json_data is not None:
+            body = _json_dumps(json_data)
+            headers = {**(headers or {}), 'Content-Type': 'application/json'}
+        idempotent = method.upper() in self.IDEMPOTENT_METHODS
+        for attempt in range(self.MAX_RETRIES + 1):
+            try:
+                await self._wait_for_rate_limit()
+                async with self._semaphore, self.session.request(
+                    method, url, params=params, data=body, headers=headers
+                ) as response:
+                    self._record_rate_limit(response)
+                    status = response.status
+                    etag = response.headers.get('ETag')
+                    if status == 304:
+                        return status, etag, None
+                    if status < 400:
+                        if as_text:
+                            return status, etag, await response.text(encoding='utf-8', errors='replace')
+                        raw = await response.read()
+                        return status, etag, _json_loads(raw) if raw else None
+                    if status == 404:
+                        logger.info("GitHub API: %s not found", url)
+                        return status, None, None
+                    if status in (403, 429):
+                        delay = self._rate_limit_delay(response)
+                        if delay is None:
+                            logger.error("GitHub API error (%s) for %s: %s", status, url, response.reason)
+                            return None, None, None
+                        if delay > self.MAX_RETRY_DELAY:
+                            logger.error("GitHub rate limit for %s resets in %.0fs, giving up", url, delay)
+                            return None, None, None
+                        logger.warning("GitHub rate limit hit for %s, retrying in %.1fs", url, delay)
+                        # Hold every other request too, not just this retry
+                        self._rate_limit_pause_until = max(
+                            self._rate_limit_pause_until, time.time() + delay
+                        )
+                    elif status >= 500:
+                        if not idempotent:
+                            logger.error("GitHub API error (%s) for %s %s, not retrying", status, method, url)
+                            return None, None, None
+                        delay = self.RETRY_BACKOFF * 2 ** attempt
+                        logger.warning("GitHub API error (%s) for %s, retrying in %.1fs", status, url, delay)
+                    else:
+                        logger.error("GitHub API error (%s) for %s: %s", status, url, response.reason)
+                        return None, None, None
+            except ClientResponseError as e:
+                # Raised while decoding the body (e.g. unexpected content type)
+                logger.error("GitHub API error (%s) for %s: %s", e.status, url, e.message)
+                return None, None, None
+            except json.JSONDecodeError as e:
+                logger.error("Unexpected error fetching %s: %s", url, e)
+                return None, None, None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if not idempotent:
+                    logger.error("Network error on %s %s: %r, not retrying", method, url, e)
+                    return None, None, None
+                delay = self.RETRY_BACKOFF * 2 ** attempt
+                logger.warning("Network error fetching %s: %r, retrying in %.1fs", url, e, delay)
+
+            if attempt < self.MAX_RETRIES:
+                await asyncio.sleep(delay)
+
+        logger.error("GitHub API request to %s failed after %d attempts", url, self.MAX_RETRIES + 1)
+        return None, None, None
+
+    async def _request(
+        self,
+        url: str,
+        method: str = 'GET',
+        params: Optional[Dict] = None,
+        json_data: Optional[Dict] = None,
+        headers: Optional[Dict[str, str]] = None,
+        as_text: bool = False,
+    ) -> Any:
+        """Send a GitHub API request and return the decoded body (None on failure)."""
+        _, _, body = await self._send(
+            url, method=method, params=params, json_data=json_data, headers=headers, as_text=as_text
+        )
+        return body
+
+    async def _cached_get(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        ttl: Optional[float] = None,
+        immutable: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Any:
+        """
+        GET with an in-memory TTL cache and ETag revalidation.
+
+        Fresh entries are served without network access; expired entries are
+        revalidated with If-None-Match (a 304 does not count against the
+        primary rate limit). Immutable entries (commits addressed by full SHA)
+        never expire. Concurrent identical requests share one HTTP call;
+        it is cancelled once every caller waiting on it has been cancelled.
+        """
+        key = url
+        if params:
+            key += '?' + '&'.join(f"{k}={v}" for k, v in sorted(params.items()))
+        if headers and 'Accept' in headers:
+            key += '#' + headers['Accept']
+        
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._cache.move_to_end(key)
+            return entry[2]
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._revalidate(key, url, params, ttl, immutable, headers)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._drop_inflight(key, _t))
+        self._inflight_waiters[key] = self._inflight_waiters.get(key, 0) + 1
+        try:
+            # Shielded so one cancelled caller does not fail the others
+            return await asyncio.shield(task)
+        finally:
+            self._inflight_waiters[key] -= 1
+            if not self._inflight_waiters[key]:
+                del self._inflight_waiters[key]
+                # Only possible if the last caller was cancelled: stop the
+                # request instead of letting it spend rate-limit budget
+                if not task.done():
+                    task.cancel()
+                    self._drop_inflight(key, task)
+
+    def _drop_inflight(self, key: str, task: asyncio.Future) -> None:
+        """Forget an in-flight request unless a newer one replaced it."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    async def _revalidate(
+        self,
+        key: str,
+        url: str,
+        params: Optional[Dict],
+        ttl: Optional[float],
+        immutable: bool,
+        headers: Optional[Dict[str, str]],
+    ) -> Any:
+        """Fetch (or conditionally re-fetch) a cache entry and store the result."""
+        entry = self._cache.get(key)
+        if entry is None and self._disk_cache is not None:
+            stored = await self._disk_cache_call(
+                self._disk_cache.get, self._disk_key_prefix + key
+            )
+            if stored is not None:
+                if immutable:
+                    self._cache[key] = (math.inf, stored[0], stored[1])
+                    return stored[1]
+                # Mutable entries are only used for revalidation
+                entry = (0.0, stored[0], stored[1])
+        
+        request_headers = dict(headers or {})
+        if entry is not None and entry[1]:
+            request_headers['If-None-Match'] = entry[1]
+        
+        status, etag, body = await self._send(
+            url, params=params, headers=request_headers or None
+        )
+        
+        if status == 304 and entry is not None:
+            body = entry[2]
+            etag = etag or entry[1]
+        elif status is None or status >= 300 or body is None:
+            return None
+        
+        expires_at = math.inf if immutable else time.monotonic() + (self.CACHE_TTL if ttl is None else ttl)
+        self._cache[key] = (expires_at, etag, body)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
+        
+        if self._disk_cache is not None:
+            disk_ttl = self.DISK_CACHE_TTL_IMMUTABLE if immutable else self.DISK_CACHE_TTL
+            await self._disk_cache_call(
+                self._disk_cache.set, self._disk_key_prefix + key, etag, body, disk_ttl
+            )
+        return body
+
+    async def _disk_cache_call(self, func, *args) -> Any:
+        """Run a blocking ETagStore operation off the event loop."""
+        try:
+            return await asyncio.to_thread(func, *args)
+        except (sqlite3.Error, zlib.error, ValueError) as e:
+            logger.warning("Persistent GitHub cache error: %s", e)
+            return None
 
     async def _fetch(
         self,
@@ -68,42 +688,77 @@ class GitHubService:
         json_data: Optional[Dict] = None
     ) -> Optional[Dict[str, Any]]:
         """Generic asynchronous fetcher for GitHub API."""
-        await self.init_session()
-        try:
-            async with self.session.request(method, url, params=params, json=json_data, timeout=10) as response:
-                response.raise_for_status()
-                return await response.json()
-        except ClientResponseError as e:
-            logger.error("GitHub API error (%s) for %s: %s", e.status, url, e.message)
+        if method == 'GET':
+            # Always revalidate, but a 304 reuses the parsed body and does
+            # not count against the rate limit
+            return await self._cached_get(url, params=params, ttl=0)
+        return await self._request(url, method=method, params=params, json_data=json_data)
+
+    async def get_repository(self, repo_path: str) -> Optional[Dict[str, Any]]:
+        """Get repository information."""
+        parsed = self._parse_repo(repo_path)
+        if parsed is None:
             return None
-        except aiohttp.ClientError as e:
-            logger.error("Network error fetching %s: %s", url, e)
+        owner, repo = parsed
+        url = f"{self.api_url}/repos/{owner}/{repo}"
+        data = await self._cached_get(url, ttl=300)
+        
+        if data:
+            return {
+                'full_name': data['full_name'],
+                'url': data['html_url'],
+                'description': data.get('description', ''),
+                'stars': data['stargazers_count'],
+                'language': data.get('language', 'N/A'),
+            }
+        return None
+
+    async def graphql(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Run a GitHub GraphQL v4 query and return its data."""
+        result = await self._fetch(
+            f"{self.api_url}/graphql",
+            method='POST',
+            json_data={"query": query, "variables": variables or {}},
+        )
+        if not result:
             return None
-        except (asyncio.TimeoutError, json.JSONDecodeError) as e:
-            logger.error("Unexpected error fetching %s: %s", url, e)
+        if result.get('errors'):
+            logger.error("GitHub GraphQL error: %s", result['errors'])
             return None
+        return result.get('data')
 
-    async def get_repository(self, repo_path: str) -> Optional[Dict[str, Any]]:
-        """Get repository information."""
-        try:
-            owner, repo = self._parse_repo_path(repo_path)
-            url = f"{self.api_url}/repos/{owner}/{repo}"
-            data = await self._fetch(url)
-            
-            if data:
-                return {
-                    'full_name': data['full_name'],
-                    'url': data['html_url'],
-                    'description': data.get('description', ''),
-                    'stars': data['stargazers_count'],
-                    'language': data.get('language', 'N/A'),
-                }
+    async def get_repo_overview(self, repo_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Get repository info, last commit and branches in one GraphQL request.
+
+        Replaces get_repository + get_last_commit + a branch listing when all
+        of them are needed together.
+        """
+        parsed = self._parse_repo(repo_path)
+        if parsed is None:
             return None
-        except ValueError as e:
-            logger.error("Invalid repository format: %s", e)
+        owner, repo = parsed
+        
+        data = await self.graphql(_REPO_OVERVIEW_QUERY, {"owner": owner, "name": repo})
+        if not data or not data.get('repository'):
             return None
+        
+        repository = data['repository']
+        target = (repository.get('defaultBranchRef') or {}).get('target') or {}
+        last_commit_date = (target.get('author') or {}).get('date')
+        return {
+            'full_name': repository['nameWithOwner'],
+            'url': repository['url'],
+            'description': repository.get('description') or '',
+            'stars': repository['stargazerCount'],
+            'language': (repository.get('primaryLanguage') or {}).get('name', 'N/A'),
+            'default_branch': (repository.get('defaultBranchRef') or {}).get('name'),
+            'last_commit_sha': target.get('oid'),
+            'last_commit': _format_github_date(last_commit_date) if last_commit_date else None,
+            'branches': [node['name'] for node in repository['refs']['nodes']],
+        }
 
-    async def get_user_repositories(self) -> Optional[List[Dict[str, Any]]]:
+    async def get_user_repositories(self) -> Optional[List[RepoSummary]]:
         """Get all user repositories."""
         url = f"{self.api_url}/user/repos"
         data = await self._fetch(url, params={"per_page": 100})
@@ -111,135 +766,175 @@ class GitHubService:
         if data:
             repos = []
             for repo in data:
-                repos.append({
-                    'full_name': repo['full_name'],
-                    'name': repo['name'],
-                    'url': repo['html_url'],
-                    'description': repo.get('description', ''),
-                    'stargazers_count': repo.get('stargazers_count', 0),
-                    'language': repo.get('language', 'Unknown'),
-                    'private': repo.get('private', False),
-                    'html_url': repo['html_url'],
-                })
+                repos.append(RepoSummary(
+                    full_name=repo['full_name'],
+                    name=repo['name'],
+                    url=repo['html_url'],
+                    description=repo.get('description', ''),
+                    stargazers_count=repo.get('stargazers_count', 0),
+                    language=repo.get('language', 'Unknown'),
+                    private=repo.get('private', False),
+                    html_url=repo['html_url'],
+                ))
             return repos
         return None
 
     async def get_last_commit(self, repo_path: str) -> Optional[str]:
         """Get date of last commit."""
-        try:
-            owner, repo = self._parse_repo_path(repo_path)
-            url = f"{self.api_url}/repos/{owner}/{repo}/commits"
-            data = await self._fetch(url, params={"per_page": 1})
-            
-            if data:
-                commit_date = data[0]['commit']['author']['date']
-                # Parse and format date
-                dt = datetime.fromisoformat(commit_date.replace('Z', '+00:00'))
-                return dt.strftime("%Y-%m-%d %H:%M:%S")
-            return None
-        except ValueError as e:
-            logger.error("Invalid repository format: %s", e)
+        parsed = self._parse_repo(repo_path)
+        if parsed is None:
             return None
+        owner, repo = parsed
+        url = f"{self.api_url}/repos/{owner}/{repo}/commits"
+        data = await self._cached_get(url, params={"per_page": 1})
+        
+        if data:
+            return _format_github_date(data[0]['commit']['author']['date'])
+        return None
 
-    async def get_commit_history(self, repo_path: str, limit: int = 50) -> Optional[List[Dict[str, Any]]]:
-        """Get commit history for a repository."""
+    async def _fetch_commits_page(
+        self,
+        owner: str,
+        repo: str,
+        per_page: int,
+        page: int
+    ) -> List[CommitSummary]:
+        """Fetch a single page of the commit list."""
+        url = f"{self.api_url}/repos/{owner}/{repo}/commits"
+        data = await self._fetch(url, params={"per_page": per_page, "page": page})
+        
+        return [
+            CommitSummary(
+                (sha := commit['sha']),
+                sha[:8],
+                (commit_data := commit['commit'])['message'],
+                (author := commit_data['author'])['name'],
+                author['email'],
+                author['date'],
+                commit['html_url'],
+            )
+            for commit in data or ()
+        ]
+
+    async def iter_commits(self, repo_path: str, limit: int = 50) -> AsyncIterator[CommitSummary]:
+        """
+        Yield up to limit commits, newest first, as their pages arrive.
+
+        All pages are requested at once (bounded by the request semaphore)
+        and yielded in order; breaking out of the loop cancels the pages that
+        are still pending. Errors are propagated to the caller.
+        """
+        parsed = self._parse_repo(repo_path)
+        if parsed is None or limit <= 0:
+            return
+        owner, repo = parsed
+        
+        per_page = min(limit, 100)
+        num_pages = math.ceil(limit / per_page)
+        tasks = [
+            asyncio.create_task(self._fetch_commits_page(owner, repo, per_page, page))
+            for page in range(1, num_pages + 1)
+        ]
         try:
-            owner, repo = self._parse_repo_path(repo_path)
-            url = f"{self.api_url}/repos/{owner}/{repo}/commits"
-            per_page = min(limit, 100)
-            
-            commits = []
-            page = 1
-            
-            while len(commits) < limit:
-                data = await self._fetch(url, params={"per_page": per_page, "page": page})
-                
-                if not data:
+            remaining = limit
+            for task in tasks:
+                page = await task
+                for commit in page[:remaining]:
+                    yield commit
+                remaining -= len(page)
+                if len(page) < per_page or remaining <= 0:
+                    # Last page reached
                     break
-                
-                for commit in data:
-                    if len(commits) >= limit:
-                        break
-                    
-                    commit_data = commit['commit']
-                    commits.append({
-                        'sha': commit['sha'],
-                        'short_sha': commit['sha'][:8],
-                        'message': commit_data['message'],
-                        'author': commit_data['author']['name'],
-                        'author_email': commit_data['author']['email'],
-                        'date': commit_data['author']['date'],
-                        'url': commit['html_url'],
-                    })
-                
-                page += 1
-            
-            return commits
-        except ValueError as e:
-            logger.error("Invalid repository format: %s", e)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def get_commit_history(self, repo_path: str, limit: int = 50) -> Optional[List[CommitSummary]]:
+        """Get commit history for a repository."""
+        if self._parse_repo(repo_path) is None:
             return None
+        try:
+            return [commit async for commit in self.iter_commits(repo_path, limit)]
+        except Exception as e:
+            logger.error("Error fetching commit history for %s: %s", repo_path, e)
+            return None
+
+    def _build_analysis_prompt(
+        self,
+        repo_path: str,
+        commits: List[CommitSummary],
+        analysis_type: str
+    ) -> str:
+        """Build the Ollama prompt for a commit history analysis."""
+        # Prepare commit data for analysis
+        commits_text = "\n\n".join(
+            f"Commit: {c['short_sha']}\n"
+            f"Author: {c['author']}\n"
+            f"Date: {c['date']}\n"
+            f"Message: {c['message'][:200]}..."
+            for c in itertools.islice(commits, 20)
+        )
+        
+        template = _PROMPT_TEMPLATES.get(analysis_type, _PROMPT_TEMPLATES["summary"])
+        prompt = template.format(repo_path=repo_path, commits_text=commits_text)
+        return prompt
+
+    async def iter_commits_analysis(
+        self,
+        repo_path: str,
+        commits: List[CommitSummary],
+        analysis_type: str = "summary"
+    ) -> AsyncIterator[str]:
+        """
+        Stream a commit history analysis from Ollama as it is generated.
+
+        Yields response fragments from Ollama's NDJSON stream; errors are
+        propagated to the caller.
+        """
+        await self.init_session()
+        prompt = self._build_analysis_prompt(repo_path, commits, analysis_type)
+        
+        url = self._ollama_url
+        json_data = {
+            "model": "mistral",
+            "prompt": prompt,
+            "stream": True,
+            "temperature": 0.7,
+            "top_p": 0.9,
+        }
+        
+        # No total limit: generation may be long, but each chunk must arrive within 60s
+        async with self.session.post(
+            url,
+            data=_json_dumps(json_data),
+            headers={"Content-Type": "application/json"},
+            timeout=aiohttp.ClientTimeout(total=None, sock_read=60),
+        ) as response:
+            response.raise_for_status()
+            async for line in response.content:
+                line = line.strip()
+                if not line:
+                    continue
+                chunk = _json_loads(line)
+                text = chunk.get("response", "")
+                if text:
+                    yield text
+                if chunk.get("done"):
+                    break
 
     async def analyze_commits_with_ai(
         self,
         repo_path: str,
-        commits: List[Dict[str, Any]],
+        commits: List[CommitSummary],
         analysis_type: str = "summary"
     ) -> Optional[str]:
         """Analyze commits using local AI (Ollama/Mistral)."""
-        await self.init_session()
         try:
-            # Prepare commit data for analysis
-            commits_text = "\n\n".join([
-                f"Commit: {c['short_sha']}\n"
-                f"Author: {c['author']}\n"
-                f"Date: {c['date']}\n"
-                f"Message: {c['message'][:200]}..."
-                for c in commits[:20]
-            ])
-            
-            # Create analysis prompt
-            prompts = {
-                "summary": f"""Analyze these commits from repository {repo_path}:
-
-{commits_text}
-
-Provide a brief summary of the development progress and key changes.""",
-                
-                "quality": f"""Analyze code quality based on these commit messages from {repo_path}:
-
-{commits_text}
-
-Assess commit quality, message clarity, and development practices.""",
-                
-                "security": f"""Analyze security-related commits from {repo_path}:
-
-{commits_text}
-
-Identify any security fixes, vulnerability patches, or security-related changes.""",
-                
-                "patterns": f"""Analyze development patterns from these commits in {repo_path}:
-
-{commits_text}
-
-Identify development patterns, release cycles, and work patterns.""",
-            }
-            
-            prompt = prompts.get(analysis_type, prompts["summary"])
-            
-            # Call Ollama API
-            url = f"{self.ollama_host}/api/generate"
-            json_data = {
-                "model": "mistral",
-                "prompt": prompt,
-                "stream": False,
-                "temperature": 0.7,
-                "top_p": 0.9,
-            }
-            
-            async with self.session.post(url, json=json_data, timeout=60) as response:
-                response.raise_for_status()
-                result = await response.json()
-                return result.get("response", "").strip()
+            parts = [
+                part async for part in self.iter_commits_analysis(repo_path, commits, analysis_type)
+            ]
+            return "".join(parts).strip()
         except ClientResponseError as e:
             logger.error("Ollama API error (%s): %s", e.status, e.message)
             return None
@@ -250,99 +945,266 @@ Identify development patterns, release cycles, and work patterns.""",
             logger.error("Error analyzing commits with AI: %s", e)
             return None
 
+    async def _get_commit_raw(self, repo_path: str, commit_sha: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the raw commit payload (metadata and files in one response).
+
+        Shared by get_commit_info, get_commit_files and cherry_pick_commit so
+        that one HTTP request serves all of them.
+        """
+        parsed = self._parse_repo(repo_path)
+        if parsed is None:
+            return None
+        owner, repo = parsed
+        url = f"{self.api_url}/repos/{owner}/{repo}/commits/{commit_sha}"
+        return await self._cached_get(url, immutable=_is_full_sha(commit_sha))
+
     async def get_commit_info(self, repo_path: str, commit_sha: str) -> Optional[Dict[str, Any]]:
         """Get commit information."""
-        try:
-            owner, repo = self._parse_repo_path(repo_path)
-            url = f"{self.api_url}/repos/{owner}/{repo}/commits/{commit_sha}"
-            data = await self._fetch(url)
-            
-            if data:
-                commit_data = data['commit']
-                return {
-                    'repo': repo_path,
-                    'sha': data['sha'],
-                    'message': commit_data['message'],
-                    'author': commit_data['author']['name'],
-                    'author_email': commit_data['author']['email'],
-                    'date': datetime.fromisoformat(
-                        commit_data['author']['date'].replace('Z', '+00:00')
-                    ).strftime("%Y-%m-%d %H:%M:%S"),
-                    'url': data['html_url'],
-                    'verified': data['commit']['verification']['verified'] if 'verification' in data['commit'] else False,
-                }
+        data = await self._get_commit_raw(repo_path, commit_sha)
+        
+        if data:
+            return self._project_commit_info(repo_path, data)
+        return None
+
+    @staticmethod
+    def _project_commit_info(repo_path: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the commit info dict from a raw commit payload."""
+        commit_data = data['commit']
+        return {
+            'repo': repo_path,
+            'sha': data['sha'],
+            'message': commit_data['message'],
+            'author': commit_data['author']['name'],
+            'author_email': commit_data['author']['email'],
+            'date': _format_github_date(commit_data['author']['date']),
+            'url': data['html_url'],
+            'verified': commit_data['verification']['verified'] if 'verification' in commit_data else False,
+        }
+
+    async def get_commits_bulk(
+        self,
+        repo_path: str,
+        commit_shas: List[str]
+    ) -> Optional[Dict[str, Optional[Dict[str, Any]]]]:
+        """
+        Get commit info for several commits in one GraphQL request.
+
+        Returns a dict keyed by the requested SHAs with the same shape as
+        get_commit_info (None for commits that were not found).
+        """
+        parsed = self._parse_repo(repo_path)
+        if parsed is None:
             return None
-        except ValueError as e:
-            logger.error("Invalid repository format: %s", e)
+        owner, repo = parsed
+        shas = list(dict.fromkeys(commit_shas))
+        if not shas:
+            return {}
+        
+        aliases = "\n".join(
+            f"    c{i}: object(expression: $e{i}) {{ ...CommitFields }}" for i in range(len(shas))
+        )
+        params = "".join(f", $e{i}: String!" for i in range(len(shas)))
+        query = (
+            f"query($owner: String!, $name: String!{params}) {{\n"
+            f"  repository(owner: $owner, name: $name) {{\n{aliases}\n  }}\n}}\n"
+            + _COMMIT_FIELDS_FRAGMENT
+        )
+        variables = {"owner": owner, "name": repo}
+        variables.update((f"e{i}", sha) for i, sha in enumerate(shas))
+        
+        data = await self.graphql(query, variables)
+        if not data or not data.get('repository'):
             return None
+        
+        repository = data['repository']
+        result = {}
+        for i, sha in enumerate(shas):
+            node = repository.get(f"c{i}")
+            if not node or 'oid' not in node:
+                result[sha] = None
+                continue
+            author = node.get('author') or {}
+            result[sha] = {
+                'repo': repo_path,
+                'sha': node['oid'],
+                'message': node['message'],
+                'author': author.get('name'),
+                'author_email': author.get('email') or '',
+                'date': _format_github_date(author['date']) if author.get('date') else None,
+                'url': node['url'],
+                'verified': bool((node.get('signature') or {}).get('isValid')),
+            }
+        return result
 
     async def get_commit_files(self, repo_path: str, commit_sha: str) -> Optional[List[Dict[str, Any]]]:
         """Get files changed in a commit."""
-        try:
-            owner, repo = self._parse_repo_path(repo_path)
-            url = f"{self.api_url}/repos/{owner}/{repo}/commits/{commit_sha}"
-            data = await self._fetch(url)
-            
-            if data and 'files' in data:
-                files = []
-                for file in data['files']:
-                    files.append({
-                        'filename': file['filename'],
-                        'status': file['status'],
-                        'additions': file['additions'],
-                        'deletions': file['deletions'],
-                        'changes': file['changes'],
-                        'patch': file.get('patch'),
-                    })
-                return files
-            return None
-        except ValueError as e:
-            logger.error("Invalid repository format: %s", e)
+        data = await self._get_commit_raw(repo_path, commit_sha)
+        
+        if data and 'files' in data:
+            return [{key: file.get(key) for key in _FILE_KEYS} for file in data['files']]
+        return None
+
+    async def get_commit_diff(self, repo_path: str, commit_sha: str) -> Optional[str]:
+        """
+        Get unified diff of a commit.
+
+        Not cached: diffs can be megabytes each and the response cache is
+        bounded by entry count, not size. Use iter_commit_diff to avoid
+        holding a large diff in memory at all.
+        """
+        parsed = self._parse_repo(repo_path)
+        if parsed is None:
             return None
+        owner, repo = parsed
+        url = f"{self.api_url}/repos/{owner}/{repo}/commits/{commit_sha}"
+        return await self._request(
+            url, headers={"Accept": "application/vnd.github.v3.diff"}, as_text=True
+        )
 
-    async def verify_commit(self, commit_info: Dict[str, Any]) -> Dict[str, bool]:
-        """Perform basic commit verification checks."""
-        # This is a placeholder for actual verification logic
-        checks = {
-            "GPG Signature": commit_info.get('verified', False),
-            "Valid Author Email": "@users.noreply.github.com" not in commit_info.get('author_email', ''),
-            "Message Length": len(commit_info.get('message', '')) > 10,
-        }
-        return checks
+    async def iter_commit_diff(self, repo_path: str, commit_sha: str) -> AsyncIterator[str]:
+        """
+        Stream the unified diff of a commit as text chunks.
+
+        Unlike get_commit_diff, the diff is never held in memory as a whole,
+        so consumers can forward or process very large diffs incrementally.
+        The stream is not cached or retried, but shares the rate-limit budget
+        and holds a concurrency slot until it is exhausted or closed.
+        """
+        parsed = self._parse_repo(repo_path)
+        if parsed is None:
+            return
+        owner, repo = parsed
+        
+        url = f"{self.api_url}/repos/{owner}/{repo}/commits/{commit_sha}"
+        await self.init_session()
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        try:
+            await self._wait_for_rate_limit()
+            async with self._semaphore, self.session.get(
+                url, headers={"Accept": "application/vnd.github.v3.diff"}
+            ) as response:
+                self._record_rate_limit(response)
+                if response.status >= 400:
+                    if response.status in (403, 429):
+                        delay = self._rate_limit_delay(response)
+                        if delay is not None:
+                            # Hold other requests; the stream itself is not retried
+                            self._rate_limit_pause_until = max(
+                                self._rate_limit_pause_until, time.time() + delay
+                            )
+                    logger.error("GitHub API error (%s) for %s: %s", response.status, url, response.reason)
+                    return
+                async for chunk in response.content.iter_chunked(self.STREAM_CHUNK_SIZE):
+                    text = decoder.decode(chunk)
+                    if text:
+                        yield text
+                tail = decoder.decode(b'', final=True)
+                if tail:
+                    yield tail
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error("Network error streaming %s: %s", url, e)
+
+    async def get_commit_bundle(self, repo_path: str, commit_sha: str) -> Dict[str, Any]:
+        """
+        Get commit info, changed files and diff concurrently.
+
+        The three requests are independent, so the total latency is that of
+        the slowest one instead of their sum.
+        """
+        info_t = asyncio.create_task(self.get_commit_info(repo_path, commit_sha))
+        files_t = asyncio.create_task(self.get_commit_files(repo_path, commit_sha))
+        diff_t = asyncio.create_task(self.get_commit_diff(repo_path, commit_sha))
+        results = await asyncio.gather(info_t, files_t, diff_t, return_exceptions=True)
+
+        bundle = {}
+        for key, result in zip(("info", "files", "diff"), results):
+            if isinstance(result, Exception):
+                logger.error("Error fetching commit %s for %s: %s", key, commit_sha, result)
+                result = None
+            bundle[key] = result
+        return bundle
+
+    def verify_commit(self, commit_info: Dict[str, Any]) -> Dict[str, bool]:
+        """Perform basic commit verification checks (pure CPU, no I/O)."""
+        return _commit_checks(
+            commit_info.get('verified', False),
+            commit_info.get('author_email', ''),
+            commit_info.get('message', ''),
+        )
+
+    def verify_commits(self, commits: List[Dict[str, Any]]) -> List[Dict[str, bool]]:
+        """Run verify_commit over already-fetched commit infos."""
+        return [
+            _commit_checks(
+                info.get('verified', False),
+                info.get('author_email', ''),
+                info.get('message', ''),
+            )
+            for info in commits
+        ]
+
+    async def get_and_verify_commits(
+        self,
+        repo_path: str,
+        shas: List[str]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Fetch and verify several commits in one pass.
+
+        Commits are fetched concurrently (bounded by the request semaphore)
+        and each result holds the commit info plus a 'checks' dict; missing
+        commits are returned as None, in the order of shas.
+        """
+        raws = await asyncio.gather(
+            *(self._get_commit_raw(repo_path, sha) for sha in shas),
+            return_exceptions=True
+        )
+        
+        results = []
+        for sha, data in zip(shas, raws):
+            if isinstance(data, Exception):
+                logger.error("Error fetching commit %s: %s", sha, data)
+                data = None
+            if not data:
+                results.append(None)
+                continue
+            info = self._project_commit_info(repo_path, data)
+            info['checks'] = _commit_checks(info['verified'], info['author_email'], info['message'])
+            results.append(info)
+        return results
 
     async def get_branch_sha(self, repo_path: str, branch: str) -> Optional[str]:
         """Get the latest commit SHA for a branch."""
-        try:
-            owner, repo = self._parse_repo_path(repo_path)
-            url = f"{self.api_url}/repos/{owner}/{repo}/branches/{branch}"
-            data = await self._fetch(url)
-            
-            if data and 'commit' in data:
-                return data['commit']['sha']
-            return None
-        except ValueError as e:
-            logger.error("Invalid repository format: %s", e)
+        parsed = self._parse_repo(repo_path)
+        if parsed is None:
             return None
+        owner, repo = parsed
+        url = f"{self.api_url}/repos/{owner}/{repo}/branches/{branch}"
+        data = await self._fetch(url)
+        
+        if data and 'commit' in data:
+            return data['commit']['sha']
+        return None
 
     async def create_branch(self, repo_path: str, new_branch: str, base_sha: str) -> bool:
         """Create a new branch from a base SHA."""
-        try:
-            owner, repo = self._parse_repo_path(repo_path)
-            url = f"{self.api_url}/repos/{owner}/{repo}/git/refs"
-            data = {
-                "ref": f"refs/heads/{new_branch}",
-                "sha": base_sha,
-            }
-            
-            result = await self._fetch(url, method='POST', json_data=data)
-            
-            if result:
-                logger.info("Created branch %s in %s", new_branch, repo_path)
-                return True
-            return False
-        except ValueError as e:
-            logger.error("Invalid repository format: %s", e)
+        parsed = self._parse_repo(repo_path)
+        if parsed is None:
             return False
+        owner, repo = parsed
+        url = f"{self.api_url}/repos/{owner}/{repo}/git/refs"
+        data = {
+            "ref": f"refs/heads/{new_branch}",
+            "sha": base_sha,
+        }
+        
+        result = await self._fetch(url, method='POST', json_data=data)
+        
+        if result:
+            logger.info("Created branch %s in %s", new_branch, repo_path)
+            return True
+        return False
 
     async def create_pull_request(
         self,
@@ -353,25 +1215,42 @@ Identify development patterns, release cycles, and work patterns.""",
         body: str
     ) -> Optional[str]:
         """Create a pull request."""
-        try:
-            owner, repo = self._parse_repo_path(repo_path)
-            url = f"{self.api_url}/repos/{owner}/{repo}/pulls"
-            data = {
-                "title": title,
-                "body": body,
-                "base": base,
-                "head": head,
-            }
-            
-            pr_data = await self._fetch(url, method='POST', json_data=data)
-            
-            if pr_data:
-                logger.info("Created PR: %s", pr_data['html_url'])
-                return pr_data['html_url']
+        parsed = self._parse_repo(repo_path)
+        if parsed is None:
             return None
-        except ValueError as e:
-            logger.error("Invalid repository format: %s", e)
+        owner, repo = parsed
+        url = f"{self.api_url}/repos/{owner}/{repo}/pulls"
+        data = {
+            "title": title,
+            "body": body,
+            "base": base,
+            "head": head,
+        }
+        
+        pr_data = await self._fetch(url, method='POST', json_data=data)
+        
+        if pr_data:
+            logger.info("Created PR: %s", pr_data['html_url'])
+            return pr_data['html_url']
+        return None
+
+    async def _get_git_commit(self, repo_path: str, commit_sha: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the git object of a commit (message, tree, author, parents).
+
+        Uses the Git Data API, which omits the file list and patches of the
+        REST commit endpoint; that API only resolves full SHAs, so short ones
+        fall back to the (cached) REST commit.
+        """
+        if not _is_full_sha(commit_sha):
+            data = await self._get_commit_raw(repo_path, commit_sha)
+            return data['commit'] if data else None
+        parsed = self._parse_repo(repo_path)
+        if parsed is None:
             return None
+        owner, repo = parsed
+        url = f"{self.api_url}/repos/{owner}/{repo}/git/commits/{commit_sha}"
+        return await self._cached_get(url, immutable=True)
 
     async def cherry_pick_commit(
         self,
@@ -380,49 +1259,46 @@ Identify development patterns, release cycles, and work patterns.""",
         target_branch: str
     ) -> Optional[str]:
         """Cherry-pick a commit to target branch."""
-        try:
-            owner, repo = self._parse_repo_path(repo_path)
-            
-            # Get commit info
-            commit_url = f"{self.api_url}/repos/{owner}/{repo}/commits/{commit_sha}"
-            commit_data = await self._fetch(commit_url)
-            if not commit_data:
-                return None
-            
-            # Get target branch HEAD
-            branch_url = f"{self.api_url}/repos/{owner}/{repo}/branches/{target_branch}"
-            branch_data = await self._fetch(branch_url)
-            if not branch_data:
-                return None
-            target_sha = branch_data['commit']['sha']
-            
-            # Create commit data
-            url = f"{self.api_url}/repos/{owner}/{repo}/git/commits"
-            new_commit_data = {
-                "message": commit_data['commit']['message'],
-                "tree": commit_data['commit']['tree']['sha'],
-                "parents": [target_sha],
-                "author": {
-                    "name": commit_data['commit']['author']['name'],
-                    "email": commit_data['commit']['author']['email'],
-                    "date": commit_data['commit']['author']['date']
-                }
-            }
-            
-            new_commit_result = await self._fetch(url, method='POST', json_data=new_commit_data)
-            if not new_commit_result:
-                return None
-            new_commit_sha = new_commit_result['sha']
-            
-            # Update branch reference
-            ref_url = f"{self.api_url}/repos/{owner}/{repo}/git/refs/heads/{target_branch}"
-            ref_data = {"sha": new_commit_sha, "force": False}
-            ref_response = await self._fetch(ref_url, method='PATCH', json_data=ref_data)
-            
-            if ref_response:
-                logger.info("Cherry-picked %s to %s", commit_sha, target_branch)
-                return new_commit_sha
+        parsed = self._parse_repo(repo_path)
+        if parsed is None:
             return None
-        except ValueError as e:
-            logger.error("Invalid repository format: %s", e)
+        owner, repo = parsed
+        
+        # Get the source git commit and target branch HEAD (independent reads)
+        branch_url = f"{self.api_url}/repos/{owner}/{repo}/branches/{target_branch}"
+        commit_data, branch_data = await asyncio.gather(
+            self._get_git_commit(repo_path, commit_sha),
+            self._fetch(branch_url),
+        )
+        if not commit_data or not branch_data:
             return None
+        target_sha = branch_data['commit']['sha']
+        
+        # Create commit data
+        url = f"{self.api_url}/repos/{owner}/{repo}/git/commits"
+        author = commit_data['author']
+        new_commit_data = {
+            "message": commit_data['message'],
+            "tree": commit_data['tree']['sha'],
+            "parents": [target_sha],
+            "author": {
+                "name": author['name'],
+                "email": author['email'],
+                "date": author['date']
+            }
+        }
+        
+        new_commit_result = await self._fetch(url, method='POST', json_data=new_commit_data)
+        if not new_commit_result:
+            return None
+        new_commit_sha = new_commit_result['sha']
+        
+        # Update branch reference
+        ref_url = f"{self.api_url}/repos/{owner}/{repo}/git/refs/heads/{target_branch}"
+        ref_data = {"sha": new_commit_sha, "force": False}
+        ref_response = await self._fetch(ref_url, method='PATCH', json_data=ref_data)
+        
+        if ref_response:
+            logger.info("Cherry-picked %s to %s", commit_sha, target_branch)
+            return new_commit_sha
+        return None
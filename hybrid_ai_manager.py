@@ -5,6 +5,7 @@ Hybrid AI Manager
 Можно использовать обе модели одновременно
 """
 
+import asyncio
 import logging
 from typing import Optional, Dict, Any
 from enum import Enum
@@ -17,7 +18,31 @@ class AnalysisMode(Enum):
     OPENAI = "openai"      # Use OpenAI GPT-3.5
     LOCAL = "local"        # Use local Ollama
     AUTO = "auto"          # Auto-select (local if available, else OpenAI)
-    HYBRID = "hybrid"      # Use both for comparison
+    HYBRID = "hybrid"      # Local draft, OpenAI verifies doubtful verdicts
+
+
+def _needs_verify(local_result: Optional[Dict[str, Any]]) -> bool:
+    """Whether a local analysis should be double-checked by OpenAI."""
+    return not local_result or not local_result.get('confident', False)
+
+
+def _combine_hybrid(
+    local_result: Optional[Dict[str, Any]],
+    openai_result: Optional[Dict[str, Any]],
+    verifier_invoked: bool
+) -> Dict[str, Any]:
+    """Merge a local draft and an optional OpenAI verification into one result."""
+    return {
+        'source': 'hybrid',
+        'verifier_invoked': verifier_invoked,
+        'local': local_result,
+        'openai': openai_result,
+        'summary': local_result.get('summary') if local_result else openai_result.get('summary'),
+        'raw': {
+            'local': local_result.get('raw') if local_result else None,
+            'openai': openai_result.get('raw') if openai_result else None
+        }
+    }
 
 
 class HybridAIManager:
@@ -168,43 +193,29 @@ class HybridAIManager:
     
     async def _analyze_hybrid(self, diff: str, commit_message: str) -> Optional[Dict[str, Any]]:
         """
-        Run both analyzers and combine results
+        Local draft first, OpenAI as verifier only when needed
+        
+        The local verdict is kept as is when it is confident; OpenAI is only
+        asked when local analysis failed or flagged concerns with a
+        REVIEW/REJECT (or unclear) verdict.
         """
         try:
-            logger.info("Running hybrid analysis (both models)...")
+            logger.info("Running hybrid analysis (local draft, OpenAI verify)...")
             
             local_result = None
-            openai_result = None
-            
-            # Run in parallel if both available
-            import asyncio
-            
-            tasks = []
             if self.local:
-                tasks.append(self.local.analyze_diff(diff, commit_message))
-            if self.openai:
-                tasks.append(self.openai.analyze_diff(diff, commit_message))
-            
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+                local_result = await self._analyze_with_local(diff, commit_message)
             
-            if self.local:
-                local_result = results[0]
-            if self.openai:
-                openai_result = results[1 if self.local else 0]
+            openai_result = None
+            verifier_invoked = False
+            if self.openai and _needs_verify(local_result):
+                verifier_invoked = True
+                openai_result = await self._analyze_with_openai(diff, commit_message)
             
-            # Combine results
-            combined = {
-                'source': 'hybrid',
-                'local': local_result,
-                'openai': openai_result,
-                'summary': local_result.get('summary') if local_result else openai_result.get('summary'),
-                'raw': {
-                    'local': local_result.get('raw') if local_result else None,
-                    'openai': openai_result.get('raw') if openai_result else None
-                }
-            }
+            if not local_result and not openai_result:
+                return None
             
-            return combined
+            return _combine_hybrid(local_result, openai_result, verifier_invoked)
         
         except Exception as e:
             logger.error("Hybrid analysis failed: %s", e)
@@ -245,6 +256,71 @@ class HybridAIManager:
         
         return None
     
+    async def analyze_all(
+        self,
+        diff: str,
+        commit_message: str,
+        mode: Optional[AnalysisMode] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Review, security and quality analysis of one diff together
+        
+        The local model answers all three from a single request (and serves
+        later per-method calls for the same diff from that result); OpenAI
+        gets the three requests concurrently. In HYBRID mode a doubtful local
+        review verdict is verified by OpenAI, as in analyze_diff.
+        
+        Returns:
+            {'analysis': ..., 'security': ..., 'quality': ...}, None if failed
+        """
+        mode = mode or self.mode
+        
+        if self.local and mode in (AnalysisMode.LOCAL, AnalysisMode.AUTO, AnalysisMode.HYBRID):
+            try:
+                result = await self.local.analyze_all(diff, commit_message)
+            except Exception as e:
+                logger.error("Local analysis failed: %s", e)
+                result = None
+            if result:
+                for section in result.values():
+                    section['source'] = 'local'
+                    section['model'] = self.local.model
+                if mode == AnalysisMode.HYBRID:
+                    openai_result = None
+                    verifier_invoked = bool(self.openai) and _needs_verify(result['analysis'])
+                    if verifier_invoked:
+                        openai_result = await self._analyze_with_openai(diff, commit_message)
+                    result['analysis'] = _combine_hybrid(
+                        result['analysis'], openai_result, verifier_invoked
+                    )
+                return result
+            if mode == AnalysisMode.LOCAL:
+                return None
+        
+        if self.openai and mode != AnalysisMode.LOCAL:
+            # _analyze_with_openai logs and swallows errors, so one failing
+            # request never cancels its siblings
+            async with asyncio.TaskGroup() as tg:
+                analysis_task = tg.create_task(
+                    self._analyze_with_openai(diff, commit_message, method='analyze_diff'),
+                    name="openai-analysis"
+                )
+                security_task = tg.create_task(
+                    self._analyze_with_openai(diff, '', method='security'),
+                    name="openai-security"
+                )
+                quality_task = tg.create_task(
+                    self._analyze_with_openai(diff, commit_message, method='quality'),
+                    name="openai-quality"
+                )
+            analysis = analysis_task.result()
+            security = security_task.result()
+            quality = quality_task.result()
+            if analysis or security or quality:
+                return {'analysis': analysis, 'security': security, 'quality': quality}
+        
+        return None
+    
     def set_mode(self, mode: AnalysisMode) -> None:
         """
         Override analysis mode
@@ -261,5 +337,6 @@ class HybridAIManager:
             'openai_available': bool(self.openai),
             'local_available': bool(self.local),
             'local_model': self.local.model if self.local else None,
-            'local_host': self.local.ollama_host if self.local else None
+            'local_host': self.local.ollama_host if self.local else None,
+            'local_cache': self.local.get_cache_stats() if self.local else None
         }
@@ -11,24 +11,358 @@ Local LLM Analyzer Service
 """
 
 import logging
-from typing import Optional, Dict, Any
+from typing import Callable, Optional, Dict, Any, List, Tuple
 import asyncio
+import functools
+import hashlib
+import json
+import math
+import re
+import sqlite3
+import time
+import zlib
+from collections import OrderedDict, deque
+from contextlib import closing
+from dataclasses import dataclass
 import aiohttp
 import os
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def _json_loads(data: bytes) -> Any:
+    """Decode JSON with orjson when available, stdlib json otherwise."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Encode JSON to bytes with orjson when available, stdlib json otherwise."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+# Section headers of the analyze_diff response format, by result key
+_ANALYSIS_HEADER_RE = re.compile(
+    r'^[ \t]*(?:'
+    r'(?P<summary>🔍[ \t]*(?:SUMMARY:)?|SUMMARY:)|'
+    r'(?P<impact>✏\ufe0f?[ \t]*(?:IMPACT:)?|IMPACT:)|'
+    r'(?P<strengths>✅[ \t]*(?:STRENGTHS:)?|STRENGTHS:)|'
+    r'(?P<concerns>⚠\ufe0f?[ \t]*(?:CONCERNS:)?|CONCERNS:)|'
+    r'(?P<recommendation>👨\u200d💻[ \t]*(?:REVIEW:)?|REVIEW:)'
+    r')',
+    re.MULTILINE,
+)
+
+# Verdict word of the REVIEW line
+_VERDICT_RE = re.compile(r'\b(APPROVE|REVIEW|REJECT)\b', re.IGNORECASE)
+
+# CONCERNS body meaning "nothing found"
+_NO_CONCERNS_RE = re.compile(r'^\W*(?:none|no|нет|отсутствуют|не обнаружено)\b', re.IGNORECASE)
+
+
+def _compress_diff(diff: str) -> str:
+    """
+    Keep only the lines of a unified diff that carry signal for the model
+    
+    Added/removed lines, hunk headers and 'diff --git' file lines are kept;
+    unchanged context, '---'/'+++' file headers (repeated by 'diff --git')
+    and '\\ No newline' markers are dropped, so the size limit is spent on
+    actual changes. Text that is not a diff is returned as is.
+    """
+    kept = [
+        line for line in diff.split('\n')
+        if (line[:1] in ('+', '-', '@') and not line.startswith(('+++ ', '--- ')))
+        or line.startswith('diff ')
+    ]
+    return '\n'.join(kept) if kept else diff
+
+
+# Prepared diffs by (sha256 of the raw diff, max_diff); keyed by digest so
+# the cache never pins raw (possibly huge) diffs in memory
+_PREP_CACHE_MAX_ENTRIES = 128
+_prep_cache: "OrderedDict[Tuple[bytes, int], str]" = OrderedDict()
+
+
+def _prep_diff(diff: str, max_diff: int = 4000) -> str:
+    """
+    Compress and truncate a diff for a local model prompt
+    
+    Cached: analyze_diff, analyze_security and get_commit_quality_score are
+    usually called on the same diff, which is then prepared only once.
+    """
+    key = (hashlib.sha256(diff.encode('utf-8', errors='surrogatepass')).digest(), max_diff)
+    prepared = _prep_cache.get(key)
+    if prepared is not None:
+        _prep_cache.move_to_end(key)
+        return prepared
+    
+    prepared = _compress_diff(diff)
+    if len(prepared) > max_diff:
+        prepared = prepared[:max_diff] + "\n... (truncated)"
+    _prep_cache[key] = prepared
+    while len(_prep_cache) > _PREP_CACHE_MAX_ENTRIES:
+        _prep_cache.popitem(last=False)
+    return prepared
+
+
+def _analysis_num_predict(diff_len: int) -> int:
+    """
+    analyze_diff token budget for a prepared diff of diff_len characters
+    
+    Scales from 120 for small diffs to 400 at the _prep_diff size cap, so
+    truncated large diffs get the full budget.
+    """
+    return max(120, min(400, 80 + diff_len * 2 // 25))
+
+
+# Fixed instructions go into Ollama's "system" field: the constant prefix is
+# then identical across requests and its KV cache can be reused, while the
+# per-commit part (message and diff) is sent as the prompt
+_ANALYSIS_SYSTEM_PROMPT = """Analyze the code change you are given. Keep response brief and in Russian.
+
+Provide analysis in this format:
+🔍 SUMMARY: One sentence summary
+✏️ IMPACT: 1 line about impact
+✅ STRENGTHS: 1 line positive aspects
+⚠️ CONCERNS: Issues or "None"
+👨‍💻 REVIEW: APPROVE/REVIEW/REJECT with reason
+
+Be concise and technical."""
+
+_SECURITY_SYSTEM_PROMPT = """Analyze the code you are given for security issues. Response in Russian, be brief.
+
+Provide:
+1. 🔐 SECURITY: Any vulnerabilities (or "None found")
+2. 🔍 RECOMMENDATIONS: 1-2 security best practices
+3. ⚠️ RISK LEVEL: LOW/MEDIUM/HIGH
+
+Be concise."""
+
+_QUALITY_SYSTEM_PROMPT = """Rate the quality of the commit you are given (1-10). Response in Russian, be brief.
+
+Provide:
+1. 🎯 SCORE: Quality score 1-10
+2. 📊 ASSESSMENT: 1-2 line assessment
+
+Be concise."""
+
+_COMBINED_SYSTEM_PROMPT = """Analyze the code change you are given. Keep response brief and in Russian.
+
+Produce THREE sections, each starting with its header line:
+
+## ANALYSIS
+🔍 SUMMARY: One sentence summary
+✏️ IMPACT: 1 line about impact
+✅ STRENGTHS: 1 line positive aspects
+⚠️ CONCERNS: Issues or "None"
+👨‍💻 REVIEW: APPROVE/REVIEW/REJECT with reason
+
+## SECURITY
+🔐 SECURITY: Any vulnerabilities (or "None found")
+🔍 RECOMMENDATIONS: 1-2 security best practices
+⚠️ RISK LEVEL: LOW/MEDIUM/HIGH
+
+## QUALITY
+🎯 SCORE: Quality score 1-10
+📊 ASSESSMENT: 1-2 line assessment
+
+Be concise and technical."""
+
+# A finished review line that carries its verdict; generation can stop once
+# one has been emitted. A bare header ("👨‍💻 REVIEW:") does not count, since
+# the verdict may follow on the next line
+_REVIEW_LINE_RE = re.compile(
+    r'^[ \t]*(?:👨\u200d💻[ \t]*REVIEW:|👨\u200d💻(?![ \t]*REVIEW:)|REVIEW:)'
+    r'[^\n]*?\b(?i:APPROVE|REVIEW|REJECT)\b[^\n]*\n',
+    re.MULTILINE,
+)
+
+# Quality score following its SCORE / 🎯 label
+_SCORE_RE = re.compile(r'(?:SCORE|🎯)\D{0,10}?(10|[1-9])\b', re.IGNORECASE)
+
+# Section headers of the combined analyze_all response
+_SECTION_RE = re.compile(r'^#{2,}\s*(ANALYSIS|SECURITY|QUALITY)\b.*$', re.MULTILINE | re.IGNORECASE)
+
+DEFAULT_LLM_CACHE_PATH = os.path.join(
+    os.path.expanduser('~'), '.cache', 'commits-verifier', 'llm', 'responses.sqlite'
+)
+
+
+@dataclass(frozen=True, slots=True)
+class _LocalConfig:
+    """LocalAnalyzer settings from the environment (None = not set)."""
+    ollama_host: Optional[str]
+    model: Optional[str]
+    quality_model: Optional[str]
+    cache_path: str
+    semantic_cache: bool
+    embed_model: str
+    concurrency: int
+
+
+def _env_positive_int(name: str, default: int) -> int:
+    """Read a positive integer setting, falling back to default if invalid."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        return max(1, int(value))
+    except ValueError:
+        logger.warning("Invalid %s=%r, using %d", name, value, default)
+        return default
+
+
+@functools.lru_cache(maxsize=1)
+def _local_cfg() -> _LocalConfig:
+    """Read the environment once; every LocalAnalyzer shares the result."""
+    return _LocalConfig(
+        ollama_host=os.getenv('OLLAMA_HOST'),
+        model=os.getenv('LOCAL_MODEL'),
+        quality_model=os.getenv('LOCAL_MODEL_QUALITY'),
+        cache_path=os.getenv('LLM_CACHE_PATH', DEFAULT_LLM_CACHE_PATH),
+        semantic_cache=os.getenv('LLM_SEMANTIC_CACHE', 'false').lower() == 'true',
+        embed_model=os.getenv('EMBED_MODEL', 'nomic-embed-text'),
+        concurrency=_env_positive_int('OLLAMA_CONCURRENCY', 4),
+    )
+
+
+@dataclass(slots=True)
+class AnalysisResult:
+    """Parsed analyze_diff response; plain dict only via to_dict()."""
+    summary: str = ''
+    impact: str = ''
+    strengths: str = ''
+    concerns: str = ''
+    recommendation: str = ''
+    raw: str = ''
+    # False when the verdict is unclear or REVIEW/REJECT with real concerns
+    confident: bool = False
+    source: str = ''
+    model: str = ''
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class LLMCache:
+    """
+    SQLite-backed cache of Ollama responses keyed by a hash of the request.
+
+    Byte-identical requests (CI re-runs, re-verified commits) are answered
+    without calling the model. Responses are stored as zlib-compressed text.
+    """
+    
+    DEFAULT_TTL = 7 * 24 * 3600
+    
+    def __init__(self, path: str):
+        """
+        Initialize the cache
+        
+        Args:
+            path: SQLite database file (created with its directory if missing)
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, body BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def make_key(
+        model: str,
+        prompt: str,
+        num_predict: int,
+        temperature: float,
+        system: str = ''
+    ) -> str:
+        """Hash everything that determines the model output."""
+        request = json.dumps(
+            {
+                "model": model,
+                "system": system,
+                "prompt": prompt,
+                "num_predict": num_predict,
+                "temperature": temperature,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(request.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response text, or None if missing or expired."""
+        with closing(sqlite3.connect(self.path)) as conn:
+            row = conn.execute(
+                "SELECT body, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            self.misses += 1
+            return None
+        self.hits += 1
+        return zlib.decompress(row[0]).decode('utf-8')
+    
+    def set(self, key: str, text: str, ttl: float = DEFAULT_TTL) -> None:
+        """Store a response text for ttl seconds."""
+        body = zlib.compress(text.encode('utf-8'))
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, body, expires_at) VALUES (?, ?, ?)",
+                (key, body, time.time() + ttl),
+            )
+    
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters since startup."""
+        return {'hits': self.hits, 'misses': self.misses}
+
+
 class LocalAnalyzer:
     """
     Local LLM-powered commit analysis using Ollama
     """
     
+    # Sampling temperature for all analyses (low enough to cache responses)
+    TEMPERATURE = 0.3
+    
+    # Semantic cache: near-duplicate diffs (reformatted, rebased) reuse an
+    # earlier analysis when their embeddings are this similar
+    SEMANTIC_THRESHOLD = 0.95
+    SEMANTIC_MIN_LENGTH = 200  # tiny diffs look alike even when they are not
+    SEMANTIC_MAX_ENTRIES = 512
+    
+    # Minimum mean summary similarity accepted by self_validate
+    QUALITY_THRESHOLD = 0.85
+    
+    # How long Ollama keeps the model loaded after each request
+    KEEP_ALIVE = "30m"
+    
+    # Seconds a check_ollama_health result is reused
+    HEALTH_TTL = 30.0
+    
+    # analyze_diffs_batch: (diff length upper bound, num_predict) per size bin
+    DIFF_SIZE_BINS = ((500, 150), (1500, 250), (None, 400))
+    
+    # Combined analyze_all results kept in memory for per-method follow-ups
+    COMBINED_MAX_ENTRIES = 64
+    
     def __init__(
         self,
         ollama_host: str = "http://localhost:11434",
         model: str = "mistral",
-        timeout: int = 60
+        timeout: int = 60,
+        cache_path: Optional[str] = None,
+        semantic_cache: Optional[bool] = None
     ):
         """
         Initialize Local Analyzer with Ollama
@@ -37,13 +371,23 @@ class LocalAnalyzer:
             ollama_host: URL to Ollama server (default: localhost:11434)
             model: Model name to use (mistral, llama2, neural-chat, dolphin-mixtral)
             timeout: Request timeout in seconds
+            cache_path: SQLite file for cached responses (default: LLM_CACHE_PATH
+                env or ~/.cache/commits-verifier/llm/responses.sqlite)
+            semantic_cache: Reuse analyses of near-duplicate diffs via Ollama
+                embeddings (default: LLM_SEMANTIC_CACHE env, off)
         """
-        self.ollama_host = os.getenv('OLLAMA_HOST', ollama_host)
-        self.model = os.getenv('LOCAL_MODEL', model)
+        cfg = _local_cfg()
+        self.ollama_host = cfg.ollama_host or ollama_host
+        self.model = cfg.model or model
+        # Higher-precision model to fall back to if self_validate finds the
+        # configured (e.g. heavily quantized) model too inaccurate
+        self.quality_model = cfg.quality_model
         self.timeout = timeout
         self.api_url = f"{self.ollama_host}/api/generate"
         self.available_models = [
             "mistral",
+            "mistral:7b-instruct-q4_K_M",
+            "mistral:7b-instruct-q8_0",
             "llama2",
             "neural-chat",
             "dolphin-mixtral",
@@ -52,93 +396,349 @@ class LocalAnalyzer:
             "zephyr"
         ]
         
+        cache_path = cache_path or cfg.cache_path
+        self.cache: Optional[LLMCache] = None
+        try:
+            self.cache = LLMCache(cache_path)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("LLM response cache disabled (%s): %s", cache_path, e)
+        
+        if semantic_cache is None:
+            semantic_cache = cfg.semantic_cache
+        self.semantic_cache = semantic_cache
+        self.embed_model = cfg.embed_model
+        # (model, unit-length embedding, response text), most recent last
+        self._semantic_entries: "deque[Tuple[str, List[float], str]]" = deque(
+            maxlen=self.SEMANTIC_MAX_ENTRIES
+        )
+        # diff hash -> (commit message, analyze_all result)
+        self._combined: "OrderedDict[str, Tuple[str, Dict[str, Any]]]" = OrderedDict()
+        # Shared keep-alive session, created on first request
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Bounds concurrent generations; request key -> in-flight generation
+        self._semaphore = asyncio.Semaphore(cfg.concurrency)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # (monotonic time, healthy) of the last health check
+        self._health_cache: Optional[Tuple[float, bool]] = None
+        
         logger.info("🤖 Local Analyzer initialized: %s @ %s", self.model, self.ollama_host)
     
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the pooled Ollama session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+    
+    async def aclose(self) -> None:
+        """Close the Ollama session (call on shutdown)."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def _cache_call(self, func, *args) -> Any:
+        """Run a blocking LLMCache operation off the event loop."""
+        try:
+            return await asyncio.to_thread(func, *args)
+        except (sqlite3.Error, zlib.error, UnicodeDecodeError) as e:
+            logger.warning("LLM response cache error: %s", e)
+            return None
+    
+    async def _generate(
+        self,
+        prompt: str,
+        num_predict: int,
+        top_p: Optional[float] = None,
+        semantic_text: Optional[str] = None,
+        stop_when: Optional[Callable[[str], bool]] = None,
+        system: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Get a completion from Ollama, served from the response cache if possible
+        
+        The response is streamed; if stop_when returns True for the text
+        received so far, the stream is closed early, which also stops the
+        generation on the Ollama side.
+        
+        Args:
+            semantic_text: Text to match against earlier requests when the
+                exact cache misses (only used with the semantic cache enabled)
+            stop_when: Predicate on the accumulated text to end generation
+            system: Fixed instructions sent as Ollama's system prompt
+        
+        Returns:
+            Response text ('' if the model returned nothing), None on HTTP error
+        """
+        key = LLMCache.make_key(self.model, prompt, num_predict, self.TEMPERATURE, system or '')
+        if self.cache is not None:
+            cached = await self._cache_call(self.cache.get, key)
+            if cached:
+                logger.info("LLM cache hit for %s", self.model)
+                return cached
+        
+        # Identical concurrent requests (e.g. a burst of webhooks for the
+        # same commit) share one generation
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._generate_uncached(
+                    key, prompt, num_predict, top_p, semantic_text, stop_when, system
+                )
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+    
+    async def _generate_uncached(
+        self,
+        key: str,
+        prompt: str,
+        num_predict: int,
+        top_p: Optional[float],
+        semantic_text: Optional[str],
+        stop_when: Optional[Callable[[str], bool]],
+        system: Optional[str]
+    ) -> Optional[str]:
+        """Generate a completion (semantic cache, then Ollama) and store it."""
+        embedding = None
+        if (
+            self.semantic_cache
+            and semantic_text is not None
+            and len(semantic_text) >= self.SEMANTIC_MIN_LENGTH
+        ):
+            embedding = await self._embed(semantic_text)
+            if embedding is not None:
+                # O(entries x dims) scan: keep it off the event loop; the
+                # snapshot lets new entries be appended meanwhile
+                match = await asyncio.to_thread(
+                    self._semantic_lookup,
+                    list(self._semantic_entries), embedding, self.model
+                )
+                if match is not None:
+                    logger.info("LLM semantic cache hit (similarity %.3f)", match[0])
+                    return match[1]
+        
+        # Ollama only reads sampling parameters from "options"
+        options = {"temperature": self.TEMPERATURE, "num_predict": num_predict}
+        if top_p is not None:
+            options["top_p"] = top_p
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": True,
+            "keep_alive": self.KEEP_ALIVE,
+            "options": options
+        }
+        if system:
+            payload["system"] = system
+        
+        parts = []
+        session = await self._get_session()
+        # One Ollama instance: bound concurrent generations
+        async with self._semaphore, session.post(
+            self.api_url,
+            data=_json_dumps(payload),
+            headers={"Content-Type": "application/json"}
+        ) as resp:
+            if resp.status != 200:
+                logger.error("Ollama error: %s", resp.status)
+                return None
+            
+            # NDJSON: one {"response": "...", "done": false} object per line
+            async for line in resp.content:
+                if not line.strip():
+                    continue
+                chunk = _json_loads(line)
+                parts.append(chunk.get('response', ''))
+                if chunk.get('done'):
+                    break
+                if stop_when is not None and stop_when(''.join(parts)):
+                    logger.debug("Stopping generation early")
+                    break
+        
+        text = ''.join(parts).strip()
+        if text and self.cache is not None:
+            await self._cache_call(self.cache.set, key, text)
+        if text and embedding is not None:
+            self._semantic_entries.append((payload["model"], embedding, text))
+        return text
+    
+    async def _embed(self, text: str) -> Optional[List[float]]:
+        """Get a unit-length embedding from Ollama (None if unavailable)."""
+        try:
+            session = await self._get_session()
+            async with session.post(
+                f"{self.ollama_host}/api/embeddings",
+                json={"model": self.embed_model, "prompt": text}
+            ) as resp:
+                if resp.status != 200:
+                    logger.debug("Ollama embeddings error: %s", resp.status)
+                    return None
+                data = _json_loads(await resp.read())
+            vector = data['embedding']
+        except (aiohttp.ClientError, asyncio.TimeoutError, KeyError, TypeError, ValueError) as e:
+            logger.debug("Ollama embeddings unavailable: %s", e)
+            return None
+        
+        norm = math.sqrt(sum(x * x for x in vector))
+        if not norm:
+            return None
+        return [x / norm for x in vector]
+    
+    def _semantic_lookup(
+        self,
+        entries: List[Tuple[str, List[float], str]],
+        embedding: List[float],
+        model: str
+    ) -> Optional[Tuple[float, str]]:
+        """Return (similarity, text) of the closest earlier response of model above threshold."""
+        best = None
+        for entry_model, vector, text in entries:
+            if entry_model != model or len(vector) != len(embedding):
+                continue
+            similarity = math.fsum(a * b for a, b in zip(vector, embedding))
+            if similarity >= self.SEMANTIC_THRESHOLD and (best is None or similarity > best[0]):
+                best = (similarity, text)
+        return best
+    
+    def get_cache_stats(self) -> Optional[Dict[str, int]]:
+        """Response cache hit/miss counters (None when caching is disabled)."""
+        return self.cache.stats() if self.cache is not None else None
+    
     async def check_ollama_health(self) -> bool:
         """
         Check if Ollama server is running and model is available
         
+        The result is reused for HEALTH_TTL seconds.
+        
         Returns:
             True if ready, False otherwise
         """
+        now = time.monotonic()
+        if self._health_cache is not None and now - self._health_cache[0] < self.HEALTH_TTL:
+            return self._health_cache[1]
+        
+        healthy = await self._query_ollama_health()
+        self._health_cache = (now, healthy)
+        return healthy
+    
+    async def _query_ollama_health(self) -> bool:
+        """Query /api/tags for the configured model."""
         try:
-            async with aiohttp.ClientSession() as session:
-                # Check if Ollama is running
-                async with session.get(
-                    f"{self.ollama_host}/api/tags",
-                    timeout=aiohttp.ClientTimeout(total=5)
-                ) as resp:
-                    if resp.status != 200:
-                        logger.warning("Ollama health check failed: %s", resp.status)
-                        return False
-                    
-                    data = await resp.json()
-                    models = [m.get('name', '').split(':')[0] for m in data.get('models', [])]
-                    
-                    if self.model in models or f"{self.model}:latest" in [m.get('name') for m in data.get('models', [])]:
-                        logger.info("✓ Model '%s' is available", self.model)
-                        return True
-                    else:
-                        logger.warning(
-                            "Model '%s' not found. Available: %s\n"
-                            "Install with: ollama pull %s",
-                            self.model, models, self.model
-                        )
-                        return False
+            session = await self._get_session()
+            # Check if Ollama is running
+            async with session.get(
+                f"{self.ollama_host}/api/tags",
+                timeout=aiohttp.ClientTimeout(total=5)
+            ) as resp:
+                if resp.status != 200:
+                    logger.warning("Ollama health check failed: %s", resp.status)
+                    return False
+                
+                data = _json_loads(await resp.read())
+                names = {m.get('name', '') for m in data.get('models', [])}
+                models = {name.split(':')[0] for name in names}
+                
+                if self.model in models or self.model in names:
+                    logger.info("✓ Model '%s' is available", self.model)
+                    return True
+                else:
+                    logger.warning(
+                        "Model '%s' not found. Available: %s\n"
+                        "Install with: ollama pull %s",
+                        self.model, sorted(models), self.model
+                    )
+                    return False
         except Exception as e:
             logger.warning("Ollama health check error: %s", e)
             return False
     
-    async def analyze_diff(self, diff: str, commit_message: str) -> Optional[Dict[str, Any]]:
+    async def warm_up(self) -> bool:
+        """
+        Load the model into Ollama ahead of the first real analysis
+        
+        Sends a one-token generation with keep_alive, so model loading
+        happens at startup instead of on the first commit.
+        
+        Returns:
+            True if the model answered
+        """
+        try:
+            session = await self._get_session()
+            async with session.post(
+                self.api_url,
+                json={
+                    "model": self.model,
+                    "prompt": "ok",
+                    "stream": False,
+                    "keep_alive": self.KEEP_ALIVE,
+                    "options": {"num_predict": 1}
+                }
+            ) as resp:
+                if resp.status != 200:
+                    logger.warning("Ollama warm-up failed: %s", resp.status)
+                    return False
+                await resp.read()
+            logger.info("✓ Model '%s' loaded", self.model)
+            return True
+        except Exception as e:
+            logger.warning("Ollama warm-up error: %s", e)
+            return False
+    
+    async def analyze_diff(
+        self,
+        diff: str,
+        commit_message: str,
+        num_predict: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Analyze commit diff with local LLM
         
         Args:
             diff: Patch/diff content
             commit_message: Commit message
+            num_predict: Maximum number of tokens to generate (default:
+                scaled with the diff size, 120-400)
             
         Returns:
             Dictionary with analysis results or None if failed
         """
+        combined = self._get_combined(diff, commit_message)
+        if combined is not None:
+            return combined['analysis'].to_dict()
+        
         try:
-            # Truncate if too large
-            max_diff = 4000  # Меньше для локальных моделей
-            if len(diff) > max_diff:
-                diff = diff[:max_diff] + "\n... (truncated)"
+            # Compress and truncate (меньше для локальных моделей)
+            diff = _prep_diff(diff)
             
-            prompt = self._create_analysis_prompt(diff, commit_message)
+            system, prompt = self._create_analysis_prompt(diff, commit_message)
             
             logger.info("Analyzing commit with %s...", self.model)
             
-            async with aiohttp.ClientSession() as session:
-                payload = {
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "temperature": 0.3,
-                    "top_p": 0.9,
-                    "num_predict": 400  # Ограничиваем размер ответа
-                }
-                
-                async with session.post(
-                    self.api_url,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout)
-                ) as resp:
-                    if resp.status != 200:
-                        logger.error("Ollama error: %s", resp.status)
-                        return None
-                    
-                    data = await resp.json()
-                    response_text = data.get('response', '')
-                    
-                    if not response_text:
-                        logger.error("Empty response from Ollama")
-                        return None
-                    
-                    result = self._parse_analysis(response_text)
-                    logger.info("Local analysis completed successfully")
-                    return result
+            # Ограничиваем размер ответа: small diffs need far fewer tokens
+            if num_predict is None:
+                num_predict = _analysis_num_predict(len(diff))
+            response_text = await self._generate(
+                prompt,
+                num_predict=num_predict,
+                top_p=0.9,
+                semantic_text=commit_message + '\n' + diff,
+                # The verdict is the last section; stop once it is complete
+                stop_when=lambda text: _REVIEW_LINE_RE.search(text) is not None,
+                system=system
+            )
+            if response_text is None:
+                return None
+            
+            if not response_text:
+                logger.error("Empty response from Ollama")
+                return None
+            
+            result = self._parse_analysis(response_text)
+            logger.info("Local analysis completed successfully")
+            return result.to_dict()
         
         except asyncio.TimeoutError:
             logger.error("Ollama request timeout (>%ss). Model might be slow or busy.", self.timeout)
@@ -147,67 +747,113 @@ class LocalAnalyzer:
             logger.error("Error during local analysis: %s", e)
             return None
     
-    def _create_analysis_prompt(self, diff: str, commit_message: str) -> str:
+    async def self_validate(self, samples: List[Tuple[str, str, str]]) -> Optional[float]:
         """
-        Create analysis prompt optimized for local models
+        Measure summary quality of the current model against known-good references
+        
+        Each sample is analyzed and its summary compared with the reference by
+        embedding cosine similarity. If the mean falls below
+        QUALITY_THRESHOLD and LOCAL_MODEL_QUALITY is set, the analyzer
+        switches to that model.
+        
+        Args:
+            samples: (diff, commit_message, reference_summary) triples
+            
+        Returns:
+            Mean similarity, or None if it could not be measured
         """
-        return f"""Analyze this code change. Keep response brief and in Russian.
-
-Commit: {commit_message}
-
-Code Diff:
-{diff}
-
-Provide analysis in this format:
-🔍 SUMMARY: One sentence summary
-✏️ IMPACT: 1 line about impact
-✅ STRENGTHS: 1 line positive aspects
-⚠️ CONCERNS: Issues or "None"
-👨‍💻 REVIEW: APPROVE/REVIEW/REJECT with reason
-
-Be concise and technical."""
+        scores = []
+        for diff, commit_message, reference in samples:
+            result = await self.analyze_diff(diff, commit_message)
+            if not result or not result.get('summary'):
+                scores.append(0.0)
+                continue
+            summary_vec, reference_vec = await asyncio.gather(
+                self._embed(result['summary']), self._embed(reference)
+            )
+            if summary_vec is None or reference_vec is None:
+                logger.warning("Model self-validation skipped: embeddings unavailable")
+                return None
+            scores.append(math.fsum(a * b for a, b in zip(summary_vec, reference_vec)))
+        if not scores:
+            return None
+        
+        quality = sum(scores) / len(scores)
+        logger.info("Model '%s' self-validation score: %.3f", self.model, quality)
+        if quality < self.QUALITY_THRESHOLD and self.quality_model and self.quality_model != self.model:
+            logger.warning(
+                "Model '%s' below quality threshold (%.3f < %.2f), falling back to '%s'",
+                self.model, quality, self.QUALITY_THRESHOLD, self.quality_model
+            )
+            self.model = self.quality_model
+            self._health_cache = None
+        return quality
     
-    def _parse_analysis(self, text: str) -> Dict[str, Any]:
+    async def analyze_diffs_batch(
+        self,
+        items: List[Tuple[str, str]]
+    ) -> List[Optional[Dict[str, Any]]]:
         """
-        Parse local LLM analysis response
+        Analyze several commits at once, binned by diff size
+        
+        Each size bin gets its own generation budget (DIFF_SIZE_BINS), so
+        small diffs are not given room for 400 tokens of filler. Requests
+        are issued shortest diff first; with the concurrency semaphore
+        this lets small commits finish without queueing behind large ones.
+        
+        Args:
+            items: (diff, commit_message) pairs
+            
+        Returns:
+            Analysis results in the order of items (None where failed)
         """
-        lines = text.split('\n')
-        result = {
-            'summary': '',
-            'impact': '',
-            'strengths': '',
-            'concerns': '',
-            'recommendation': '',
-            'raw': text
+        def budget(diff: str) -> int:
+            for limit, num_predict in self.DIFF_SIZE_BINS:
+                if limit is None or len(diff) < limit:
+                    return num_predict
+            return self.DIFF_SIZE_BINS[-1][1]
+        
+        order = sorted(range(len(items)), key=lambda i: len(items[i][0]))
+        tasks = {
+            i: asyncio.ensure_future(
+                self.analyze_diff(items[i][0], items[i][1], num_predict=budget(items[i][0]))
+            )
+            for i in order
         }
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        return [
+            None if tasks[i].exception() is not None else tasks[i].result()
+            for i in range(len(items))
+        ]
+    
+    def _create_analysis_prompt(self, diff: str, commit_message: str) -> Tuple[str, str]:
+        """
+        Create (system, prompt) for analysis, optimized for local models
+        """
+        return _ANALYSIS_SYSTEM_PROMPT, f"Commit: {commit_message}\n\nCode Diff:\n{diff}"
+    
+    def _parse_analysis(self, text: str) -> AnalysisResult:
+        """
+        Parse local LLM analysis response
+        """
+        result = AnalysisResult(raw=text, source='local', model=self.model)
         
-        current_section = None
+        # Each section runs from its header to the next header; lines before
+        # the first header are ignored
+        matches = list(_ANALYSIS_HEADER_RE.finditer(text))
+        for match, following in zip(matches, matches[1:] + [None]):
+            body = text[match.end():following.start() if following else len(text)]
+            setattr(result, match.lastgroup, ' '.join(
+                line.strip() for line in body.splitlines() if line.strip()
+            ))
         
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            if line.startswith('🔍') or line.startswith('SUMMARY:'):
-                result['summary'] = line.replace('🔍', '').replace('SUMMARY:', '').strip()
-                current_section = 'summary'
-            elif line.startswith('✏️') or line.startswith('IMPACT:'):
-                result['impact'] = line.replace('✏️', '').replace('IMPACT:', '').strip()
-                current_section = 'impact'
-            elif line.startswith('✅') or line.startswith('STRENGTHS:'):
-                result['strengths'] = line.replace('✅', '').replace('STRENGTHS:', '').strip()
-                current_section = 'strengths'
-            elif line.startswith('⚠️') or line.startswith('CONCERNS:'):
-                result['concerns'] = line.replace('⚠️', '').replace('CONCERNS:', '').strip()
-                current_section = 'concerns'
-            elif line.startswith('👨‍💻') or line.startswith('REVIEW:'):
-                result['recommendation'] = line.replace('👨‍💻', '').replace('REVIEW:', '').strip()
-                current_section = 'recommendation'
-            elif current_section and line:
-                if result[current_section]:
-                    result[current_section] += ' ' + line
-                else:
-                    result[current_section] = line
+        # Low confidence (worth a second opinion): no clear verdict, or a
+        # REVIEW/REJECT verdict backed by actual concerns
+        verdict = _VERDICT_RE.search(result.recommendation)
+        concerns = result.concerns and not _NO_CONCERNS_RE.match(result.concerns)
+        result.confident = verdict is not None and not (
+            concerns and verdict.group(1).upper() in ('REVIEW', 'REJECT')
+        )
         
         return result
     
@@ -215,45 +861,25 @@ Be concise and technical."""
         """
         Security-focused analysis with local LLM
         """
+        combined = self._get_combined(diff)
+        if combined is not None:
+            return dict(combined['security'])
+        
         try:
-            max_diff = 4000
-            if len(diff) > max_diff:
-                diff = diff[:max_diff] + "\n... (truncated)"
+            diff = _prep_diff(diff)
             
-            prompt = f"""Analyze this code for security issues. Response in Russian, be brief.
-
-Code Diff:
-{diff}
-
-Provide:
-1. 🔐 SECURITY: Any vulnerabilities (or "None found")
-2. 🔍 RECOMMENDATIONS: 1-2 security best practices
-3. ⚠️ RISK LEVEL: LOW/MEDIUM/HIGH
-
-Be concise."""
+            prompt = f"Code Diff:\n{diff}"
             
-            async with aiohttp.ClientSession() as session:
-                payload = {
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "temperature": 0.3,
-                    "num_predict": 250
-                }
-                
-                async with session.post(
-                    self.api_url,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout)
-                ) as resp:
-                    if resp.status != 200:
-                        return None
-                    
-                    data = await resp.json()
-                    return {
-                        'security_analysis': data.get('response', ''),
-                        'raw': data.get('response', '')
-                    }
+            response_text = await self._generate(
+                prompt, num_predict=250, system=_SECURITY_SYSTEM_PROMPT
+            )
+            if response_text is None:
+                return None
+            
+            return {
+                'security_analysis': response_text,
+                'raw': response_text
+            }
         
         except Exception as e:
             logger.error("Error during security analysis: %s", e)
@@ -263,62 +889,112 @@ Be concise."""
         """
         Get commit quality score with local LLM
         """
+        combined = self._get_combined(diff, commit_message)
+        if combined is not None:
+            return dict(combined['quality'])
+        
         try:
-            max_diff = 4000
-            if len(diff) > max_diff:
-                diff = diff[:max_diff] + "\n... (truncated)"
+            diff = _prep_diff(diff)
             
-            prompt = f"""Rate commit quality (1-10). Response in Russian, be brief.
-
-Commit: {commit_message}
-
-Code Diff:
-{diff}
-
-Provide:
-1. 🎯 SCORE: Quality score 1-10
-2. 📊 ASSESSMENT: 1-2 line assessment
-
-Be concise."""
+            prompt = f"Commit: {commit_message}\n\nCode Diff:\n{diff}"
             
-            async with aiohttp.ClientSession() as session:
-                payload = {
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "temperature": 0.3,
-                    "num_predict": 200
-                }
-                
-                async with session.post(
-                    self.api_url,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout)
-                ) as resp:
-                    if resp.status != 200:
-                        return None
-                    
-                    data = await resp.json()
-                    analysis = data.get('response', '')
-                    
-                    # Try to extract score
-                    score = None
-                    for line in analysis.split('\n'):
-                        for word in line.split():
-                            if word.isdigit():
-                                s = int(word)
-                                if 1 <= s <= 10:
-                                    score = s
-                                    break
-                        if score:
-                            break
-                    
-                    return {
-                        'analysis': analysis,
-                        'score': score,
-                        'raw': analysis
-                    }
+            analysis = await self._generate(
+                prompt, num_predict=200, system=_QUALITY_SYSTEM_PROMPT
+            )
+            if analysis is None:
+                return None
+            
+            return {
+                'analysis': analysis,
+                'score': self._extract_score(analysis),
+                'raw': analysis
+            }
         
         except Exception as e:
             logger.error("Error getting quality score: %s", e)
             return None
+    
+    @staticmethod
+    def _extract_score(analysis: str) -> Optional[int]:
+        """
+        Extract the 1-10 score from a quality analysis ('🎯 SCORE: 8')
+        """
+        match = _SCORE_RE.search(analysis)
+        return int(match.group(1)) if match else None
+    
+    @staticmethod
+    def _diff_key(diff: str) -> str:
+        return hashlib.sha256(diff.encode('utf-8', errors='replace')).hexdigest()
+    
+    def _get_combined(self, diff: str, commit_message: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Return a memoized analyze_all result for this diff (and message, if given)
+        """
+        entry = self._combined.get(self._diff_key(diff))
+        if entry is None or (commit_message is not None and entry[0] != commit_message):
+            return None
+        return entry[1]
+    
+    async def analyze_all(self, diff: str, commit_message: str) -> Optional[Dict[str, Any]]:
+        """
+        Run review, security and quality analysis in a single Ollama request
+        
+        The diff is sent (and tokenized) once instead of three times. The
+        result is memoized, so later analyze_diff / analyze_security /
+        get_commit_quality_score calls for the same diff are answered from it.
+        
+        Returns:
+            {'analysis': ..., 'security': ..., 'quality': ...} shaped like the
+            individual methods' results, or None if failed
+        """
+        key = self._diff_key(diff)
+        try:
+            diff = _prep_diff(diff)
+            
+            prompt = f"Commit: {commit_message}\n\nCode Diff:\n{diff}"
+            
+            logger.info("Running combined analysis with %s...", self.model)
+            response_text = await self._generate(
+                prompt, num_predict=800, top_p=0.9, system=_COMBINED_SYSTEM_PROMPT
+            )
+            if not response_text:
+                return None
+            
+            # re.split with one group: [preamble, name1, body1, name2, body2, ...]
+            parts = _SECTION_RE.split(response_text)
+            sections = {
+                name.upper(): body.strip() for name, body in zip(parts[1::2], parts[2::2])
+            }
+            analysis_text = sections.get('ANALYSIS', parts[0].strip())
+            security_text = sections.get('SECURITY', '')
+            quality_text = sections.get('QUALITY', '')
+            
+            result = {
+                'analysis': self._parse_analysis(analysis_text),
+                'security': {
+                    'security_analysis': security_text,
+                    'raw': security_text
+                },
+                'quality': {
+                    'analysis': quality_text,
+                    'score': self._extract_score(quality_text),
+                    'raw': quality_text
+                },
+            }
+            
+            self._combined[key] = (commit_message, result)
+            self._combined.move_to_end(key)
+            while len(self._combined) > self.COMBINED_MAX_ENTRIES:
+                self._combined.popitem(last=False)
+            return {
+                'analysis': result['analysis'].to_dict(),
+                'security': dict(result['security']),
+                'quality': dict(result['quality']),
+            }
+        
+        except asyncio.TimeoutError:
+            logger.error("Ollama request timeout (>%ss). Model might be slow or busy.", self.timeout)
+            return None
+        except Exception as e:
+            logger.error("Error during combined analysis: %s", e)
+            return None
@@ -40,8 +40,12 @@ async def main():
         print("   docker pull ollama/ollama")
         print("   docker run -d -p 11434:11434 -v ollama:/root/.ollama ollama/ollama")
         print("   docker exec ollama ollama pull mistral\n")
+        await analyzer.aclose()
         return False
     
+    # Load the model before timing the analysis
+    await analyzer.warm_up()
+    
     # Test analysis
     print("3. Testing commit analysis...")
     
@@ -60,6 +64,7 @@ async def main():
     print("   Analyzing... (this may take 10-30 seconds)\n")
     
     analysis = await analyzer.analyze_diff(test_diff, test_message)
+    await analyzer.aclose()
     
     if analysis:
         print("   ✓ Analysis completed!\n")
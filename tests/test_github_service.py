@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for GitHubService request plumbing (no network access)
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from github_service import GitHubService  # noqa: E402
+
+
+def test_cancelling_last_waiter_cancels_shared_request():
+    async def scenario():
+        service = GitHubService("token")
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def slow_revalidate(*args):
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        service._revalidate = slow_revalidate
+        url = "https://api.github.com/repos/o/r/commits"
+        first = asyncio.create_task(service._cached_get(url))
+        second = asyncio.create_task(service._cached_get(url))
+        await started.wait()
+
+        # One of two waiters leaving keeps the request alive
+        first.cancel()
+        await asyncio.gather(first, return_exceptions=True)
+        await asyncio.sleep(0)
+        assert not cancelled.is_set()
+
+        second.cancel()
+        await asyncio.gather(second, return_exceptions=True)
+        await asyncio.wait_for(cancelled.wait(), 1)
+        assert not service._inflight and not service._inflight_waiters
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("repo_path, expected", [
+    ("sileade/repo", ("sileade", "repo")),
+    ("https://github.com/sileade/repo/tree/main", ("sileade", "repo")),
+    ("https://gitlab.com/sileade/repo", None),
+    ("sileade/repo/extra", None),
+])
+def test_parse_repo_matches_repository_parser(repo_path, expected):
+    assert GitHubService._parse_repo(repo_path) == expected
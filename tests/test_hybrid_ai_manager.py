@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for HybridAIManager mode handling (analyzers are stubbed)
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from hybrid_ai_manager import AnalysisMode, HybridAIManager  # noqa: E402
+
+
+class StubLocal:
+    model = 'local-model'
+
+    def __init__(self, confident):
+        self.confident = confident
+
+    async def analyze_all(self, diff, commit_message):
+        return {
+            'analysis': {'summary': 'local', 'raw': 'local raw', 'confident': self.confident},
+            'security': {'security_analysis': '', 'raw': ''},
+            'quality': {'analysis': '', 'score': 7, 'raw': ''},
+        }
+
+
+class StubOpenAI:
+    model = 'openai-model'
+
+    def __init__(self):
+        self.calls = 0
+
+    async def analyze_diff(self, diff, commit_message):
+        self.calls += 1
+        return {'summary': 'openai', 'raw': 'openai raw'}
+
+
+def test_analyze_all_hybrid_verifies_doubtful_verdict():
+    openai = StubOpenAI()
+    manager = HybridAIManager(openai, StubLocal(confident=False))
+    result = asyncio.run(manager.analyze_all('diff', 'msg', mode=AnalysisMode.HYBRID))
+    assert openai.calls == 1
+    assert result['analysis']['verifier_invoked']
+    assert result['analysis']['openai']['summary'] == 'openai'
+
+
+def test_analyze_all_hybrid_keeps_confident_local_verdict():
+    openai = StubOpenAI()
+    manager = HybridAIManager(openai, StubLocal(confident=True))
+    result = asyncio.run(manager.analyze_all('diff', 'msg', mode=AnalysisMode.HYBRID))
+    assert openai.calls == 0
+    assert not result['analysis']['verifier_invoked']
+    assert result['analysis']['local']['summary'] == 'local'
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for local_analyzer helpers (no Ollama server needed)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from local_analyzer import (  # noqa: E402
+    LocalAnalyzer,
+    _REVIEW_LINE_RE,
+    _analysis_num_predict,
+    _env_positive_int,
+    _prep_diff,
+)
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    return LocalAnalyzer(cache_path=str(tmp_path / "responses.sqlite"))
+
+
+def test_stop_on_review_line_with_verdict():
+    assert _REVIEW_LINE_RE.search("🔍 SUMMARY: x\n👨‍💻 REVIEW: APPROVE - looks good\n")
+    assert _REVIEW_LINE_RE.search("REVIEW: REJECT - breaks the build\n")
+
+
+def test_no_stop_on_bare_review_header():
+    # The verdict can come on the line after the header
+    text = "⚠️ CONCERNS: None\n👨‍💻 REVIEW:\n"
+    assert _REVIEW_LINE_RE.search(text) is None
+
+
+def test_split_line_verdict_is_parsed(analyzer):
+    text = "⚠️ CONCERNS: None\n👨‍💻 REVIEW:\nAPPROVE - small fix\n"
+    result = analyzer._parse_analysis(text)
+    assert result.recommendation == "APPROVE - small fix"
+    assert result.confident
+
+
+def test_large_diff_gets_full_token_budget():
+    diff = ''.join(f"+line {i}\n" for i in range(100_000))
+    assert _analysis_num_predict(len(_prep_diff(diff))) == 400
+
+
+def test_small_diff_gets_minimum_token_budget():
+    assert _analysis_num_predict(len(_prep_diff("+x = 1\n"))) == 120
+
+
+@pytest.mark.parametrize("value, expected", [("8", 8), ("0", 1), ("-3", 1), ("many", 4)])
+def test_concurrency_setting_is_sanitized(monkeypatch, value, expected):
+    monkeypatch.setenv("OLLAMA_CONCURRENCY", value)
+    assert _env_positive_int("OLLAMA_CONCURRENCY", 4) == expected
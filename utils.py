@@ -4,12 +4,142 @@ Utility functions and helpers
 Помощние функции для парсинга, валидации и обработки данных
 """
 
-import re
+import asyncio
+import functools
+import string
 import logging
+from time import monotonic
 from typing import Tuple, Optional
 
 logger = logging.getLogger(__name__)
 
+# str.translate table dropping control characters except tab and newline
+_CONTROL_STRIP = {i: None for i in range(32) if i not in (9, 10)}
+
+# Suffix marking truncated text
+_ELLIPSIS = "..."
+
+# SHA lengths and input limits (also exposed on CommitValidator / InputSanitizer)
+_SHORT_SHA_LENGTH = 7
+_FULL_SHA_LENGTH = 40
+_MAX_REPO_PATH_LENGTH = 200
+_MAX_MESSAGE_LENGTH = 2000
+
+# Prefix of masked tokens
+_MASK_PREFIX = '...'
+
+# format_bytes units, 1024 apart
+_BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# TextFormatter emoji by verification / file change status
+_STATUS_EMOJI = {
+    'approved': '✅',
+    'rejected': '❌',
+}
+_STATUS_EMOJI_GET = _STATUS_EMOJI.get
+_FILE_EMOJI = {
+    'added': '🆕',
+    'modified': '✍️',
+    'removed': '❌',
+    'renamed': '📄',
+    'copied': '📃',
+}
+_FILE_EMOJI_GET = _FILE_EMOJI.get
+
+# Characters allowed in GitHub owner and repository names
+_OWNER_CHARS = frozenset(string.ascii_letters + string.digits + '_-')
+_REPO_CHARS = _OWNER_CHARS | {'.'}
+
+# GitHub URL forms accepted by parse_repo_path; each ends with 'github.com/'
+_URL_PREFIXES = (
+    'https://github.com/',
+    'http://github.com/',
+    'https://www.github.com/',
+    'http://www.github.com/',
+    'github.com/',
+    'www.github.com/',
+)
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_repo_path_cached(repo_path: str) -> Tuple[str, str]:
+    """Parse a repository path string; repeated paths are served from the cache."""
+    repo_path = repo_path.strip()
+    
+    if repo_path.startswith(_URL_PREFIXES):
+        # GitHub URL format: github.com/owner/repo[/anything on one line]
+        owner, _, rest = repo_path.partition('github.com/')[2].partition('/')
+        repo, _, extra = rest.partition('/')
+        if (owner and repo and '\n' not in extra
+                and _OWNER_CHARS.issuperset(owner) and _REPO_CHARS.issuperset(repo)):
+            return owner, repo
+    else:
+        # Plain 'owner/repo' format
+        owner, _, repo = repo_path.partition('/')
+        if (owner and repo and '/' not in repo
+                and _OWNER_CHARS.issuperset(owner) and _REPO_CHARS.issuperset(repo)):
+            return owner, repo
+    
+    raise ValueError(
+        f"Invalid repository format: '{repo_path}'. "
+        "Use 'owner/repo' or 'https://github.com/owner/repo'"
+    )
+
+
+# RepositoryParser, CommitValidator and InputSanitizer expose the module-level
+# functions below as static methods; internal calls use the functions directly
+def _parse_repo_path(repo_path: str) -> Tuple[str, str]:
+    """
+    Parse repository path from URL or owner/repo format
+    
+    Args:
+        repo_path: GitHub URL or 'owner/repo' format
+        
+    Returns:
+        Tuple[owner, repo]: Parsed owner and repository name
+        
+    Raises:
+        ValueError: If repository path format is invalid
+        
+    Examples:
+        >>> RepositoryParser.parse_repo_path('https://github.com/sileade/repo')
+        ('sileade', 'repo')
+        >>> RepositoryParser.parse_repo_path('sileade/repo')
+        ('sileade', 'repo')
+    """
+    if not isinstance(repo_path, str) or not repo_path:
+        raise ValueError("Repository path must be a non-empty string")
+    
+    return _parse_repo_path_cached(repo_path)
+
+
+def _get_repo_name(repo_path: str) -> str:
+    """
+    Extract repository name from path
+    
+    Args:
+        repo_path: Repository path or URL
+        
+    Returns:
+        str: Repository name
+    """
+    _, repo = _parse_repo_path(repo_path)
+    return repo
+
+
+def _get_repo_owner(repo_path: str) -> str:
+    """
+    Extract repository owner from path
+    
+    Args:
+        repo_path: Repository path or URL
+        
+    Returns:
+        str: Repository owner
+    """
+    owner, _ = _parse_repo_path(repo_path)
+    return owner
+
 
 class RepositoryParser:
     """
@@ -17,82 +147,92 @@ class RepositoryParser:
     Парсинг GitHub репозиториев
     """
     
-    GITHUB_URL_REGEX = re.compile(
-        r'^(?:https?://)?(?:www\.)?github\.com/([a-zA-Z0-9_-]+)/([a-zA-Z0-9_.-]+)(?:/.*)?$'
-    )
-    OWNER_REPO_REGEX = re.compile(r'^([a-zA-Z0-9_-]+)/([a-zA-Z0-9_.-]+)$')
+    parse_repo_path = staticmethod(_parse_repo_path)
+    get_repo_name = staticmethod(_get_repo_name)
+    get_repo_owner = staticmethod(_get_repo_owner)
+
+
+def _validate_and_strip(sha: str) -> Optional[str]:
+    """Return the stripped, lowercased SHA if it is valid, else None."""
+    if not isinstance(sha, str):
+        return None
     
-    @staticmethod
-    def parse_repo_path(repo_path: str) -> Tuple[str, str]:
-        """
-        Parse repository path from URL or owner/repo format
-        
-        Args:
-            repo_path: GitHub URL or 'owner/repo' format
-            
-        Returns:
-            Tuple[owner, repo]: Parsed owner and repository name
-            
-        Raises:
-            ValueError: If repository path format is invalid
-            
-        Examples:
-            >>> RepositoryParser.parse_repo_path('https://github.com/sileade/repo')
-            ('sileade', 'repo')
-            >>> RepositoryParser.parse_repo_path('sileade/repo')
-            ('sileade', 'repo')
-        """
-        if not repo_path or not isinstance(repo_path, str):
-            raise ValueError("Repository path must be a non-empty string")
+    sha = sha.strip()
+    n = len(sha)
+    # bytes.fromhex skips whitespace between bytes; isalnum rules it out
+    if not (7 <= n <= 40) or not sha.isalnum():
+        return None
+    try:
+        bytes.fromhex(sha if n % 2 == 0 else '0' + sha)
+    except ValueError:
+        return None
+    return sha.lower()
+
+
+def _validate_commit_sha(sha: str) -> bool:
+    """
+    Validate commit SHA format
+    
+    Args:
+        sha: Commit SHA to validate
         
-        repo_path = repo_path.strip()
+    Returns:
+        bool: True if SHA is valid
         
-        # Try GitHub URL format first
-        url_match = RepositoryParser.GITHUB_URL_REGEX.match(repo_path)
-        if url_match:
-            owner, repo = url_match.groups()
-            if not owner or not repo:
-                raise ValueError(f"Invalid GitHub URL: {repo_path}")
-            return owner, repo
+    Examples:
+        >>> CommitValidator.validate_commit_sha('abc1234')
+        True
+        >>> CommitValidator.validate_commit_sha('invalid')
+        False
+    """
+    return _validate_and_strip(sha) is not None
+
+
+def _normalize_commit_sha(sha: str) -> str:
+    """
+    Normalize commit SHA (lowercase, stripped)
+    
+    Args:
+        sha: Commit SHA
         
-        # Try owner/repo format
-        owner_repo_match = RepositoryParser.OWNER_REPO_REGEX.match(repo_path)
-        if owner_repo_match:
-            owner, repo = owner_repo_match.groups()
-            return owner, repo
+    Returns:
+        str: Normalized SHA
         
-        raise ValueError(
-            f"Invalid repository format: '{repo_path}'. "
-            "Use 'owner/repo' or 'https://github.com/owner/repo'"
-        )
+    Raises:
+        ValueError: If SHA is invalid
+    """
+    normalized = _validate_and_strip(sha)
+    if normalized is None:
+        raise ValueError(f"Invalid commit SHA: {sha}")
+    return normalized
+
+
+def _is_short_sha(sha: str) -> bool:
+    """
+    Check if SHA is a short SHA (7 characters)
     
-    @staticmethod
-    def get_repo_name(repo_path: str) -> str:
-        """
-        Extract repository name from path
+    Args:
+        sha: Commit SHA
         
-        Args:
-            repo_path: Repository path or URL
-            
-        Returns:
-            str: Repository name
-        """
-        _, repo = RepositoryParser.parse_repo_path(repo_path)
-        return repo
+    Returns:
+        bool: True if short SHA
+    """
+    normalized = _validate_and_strip(sha)
+    return normalized is not None and len(normalized) == _SHORT_SHA_LENGTH
+
+
+def _is_full_sha(sha: str) -> bool:
+    """
+    Check if SHA is a full SHA (40 characters)
     
-    @staticmethod
-    def get_repo_owner(repo_path: str) -> str:
-        """
-        Extract repository owner from path
+    Args:
+        sha: Commit SHA
         
-        Args:
-            repo_path: Repository path or URL
-            
-        Returns:
-            str: Repository owner
-        """
-        owner, _ = RepositoryParser.parse_repo_path(repo_path)
-        return owner
+    Returns:
+        bool: True if full SHA
+    """
+    normalized = _validate_and_strip(sha)
+    return normalized is not None and len(normalized) == _FULL_SHA_LENGTH
 
 
 class CommitValidator:
@@ -101,81 +241,83 @@ class CommitValidator:
     Валидация SHA коммитов
     """
     
-    # Match 7-40 character hex strings (short to full SHA)
-    SHA_REGEX = re.compile(r'^[a-f0-9]{7,40}$', re.IGNORECASE)
-    SHORT_SHA_LENGTH = 7
-    FULL_SHA_LENGTH = 40
+    SHORT_SHA_LENGTH = _SHORT_SHA_LENGTH
+    FULL_SHA_LENGTH = _FULL_SHA_LENGTH
     
-    @staticmethod
-    def validate_commit_sha(sha: str) -> bool:
-        """
-        Validate commit SHA format
+    _validate_and_strip = staticmethod(_validate_and_strip)
+    validate_commit_sha = staticmethod(_validate_commit_sha)
+    normalize_commit_sha = staticmethod(_normalize_commit_sha)
+    is_short_sha = staticmethod(_is_short_sha)
+    is_full_sha = staticmethod(_is_full_sha)
+
+
+def _sanitize_repo_path(repo_path: str) -> str:
+    """
+    Sanitize repository path input
+    
+    Args:
+        repo_path: Repository path
         
-        Args:
-            sha: Commit SHA to validate
-            
-        Returns:
-            bool: True if SHA is valid
-            
-        Examples:
-            >>> CommitValidator.validate_commit_sha('abc1234')
-            True
-            >>> CommitValidator.validate_commit_sha('invalid')
-            False
-        """
-        if not isinstance(sha, str):
-            return False
+    Returns:
+        str: Sanitized path
         
-        sha = sha.strip()
-        return bool(CommitValidator.SHA_REGEX.match(sha))
+    Raises:
+        ValueError: If input is too long or invalid
+    """
+    if not isinstance(repo_path, str):
+        raise ValueError("Repository path must be a string")
     
-    @staticmethod
-    def normalize_commit_sha(sha: str) -> str:
-        """
-        Normalize commit SHA (lowercase, stripped)
-        
-        Args:
-            sha: Commit SHA
-            
-        Returns:
-            str: Normalized SHA
-            
-        Raises:
-            ValueError: If SHA is invalid
-        """
-        if not CommitValidator.validate_commit_sha(sha):
-            raise ValueError(f"Invalid commit SHA: {sha}")
-        return sha.strip().lower()
+    repo_path = repo_path.strip()
     
-    @staticmethod
-    def is_short_sha(sha: str) -> bool:
-        """
-        Check if SHA is a short SHA (7 characters)
+    if len(repo_path) == 0:
+        raise ValueError("Repository path cannot be empty")
+    
+    if len(repo_path) > _MAX_REPO_PATH_LENGTH:
+        raise ValueError(
+            f"Repository path too long (max {_MAX_REPO_PATH_LENGTH} chars)"
+        )
+    
+    # Remove any control characters
+    repo_path = repo_path.translate(_CONTROL_STRIP)
+    
+    return repo_path
+
+
+def _sanitize_commit_sha(sha: str) -> str:
+    """
+    Sanitize commit SHA input
+    
+    Args:
+        sha: Commit SHA
         
-        Args:
-            sha: Commit SHA
-            
-        Returns:
-            bool: True if short SHA
-        """
-        if not CommitValidator.validate_commit_sha(sha):
-            return False
-        return len(sha.strip()) == CommitValidator.SHORT_SHA_LENGTH
+    Returns:
+        str: Sanitized SHA
+        
+    Raises:
+        ValueError: If SHA is invalid
+    """
+    if not isinstance(sha, str):
+        raise ValueError("Commit SHA must be a string")
     
-    @staticmethod
-    def is_full_sha(sha: str) -> bool:
-        """
-        Check if SHA is a full SHA (40 characters)
+    normalized = _validate_and_strip(sha)
+    if normalized is None:
+        raise ValueError(f"Invalid commit SHA format: {sha.strip()}")
+    
+    return normalized
+
+
+def _truncate_message(message: str, max_length: int = _MAX_MESSAGE_LENGTH) -> str:
+    """
+    Truncate message to maximum length
+    
+    Args:
+        message: Message to truncate
+        max_length: Maximum length
         
-        Args:
-            sha: Commit SHA
-            
-        Returns:
-            bool: True if full SHA
-        """
-        if not CommitValidator.validate_commit_sha(sha):
-            return False
-        return len(sha.strip()) == CommitValidator.FULL_SHA_LENGTH
+    Returns:
+        str: Truncated message
+    """
+    return message if len(message) <= max_length else message[:max_length - 3] + _ELLIPSIS
 
 
 class InputSanitizer:
@@ -184,80 +326,59 @@ class InputSanitizer:
     Очистка пользовательского ввода
     """
     
-    MAX_REPO_PATH_LENGTH = 200
-    MAX_MESSAGE_LENGTH = 2000
+    MAX_REPO_PATH_LENGTH = _MAX_REPO_PATH_LENGTH
+    MAX_MESSAGE_LENGTH = _MAX_MESSAGE_LENGTH
     
-    @staticmethod
-    def sanitize_repo_path(repo_path: str) -> str:
-        """
-        Sanitize repository path input
-        
-        Args:
-            repo_path: Repository path
-            
-        Returns:
-            str: Sanitized path
-            
-        Raises:
-            ValueError: If input is too long or invalid
-        """
-        if not isinstance(repo_path, str):
-            raise ValueError("Repository path must be a string")
-        
-        repo_path = repo_path.strip()
-        
-        if len(repo_path) == 0:
-            raise ValueError("Repository path cannot be empty")
-        
-        if len(repo_path) > InputSanitizer.MAX_REPO_PATH_LENGTH:
-            raise ValueError(
-                f"Repository path too long (max {InputSanitizer.MAX_REPO_PATH_LENGTH} chars)"
-            )
-        
-        # Remove any control characters
-        repo_path = ''.join(c for c in repo_path if ord(c) >= 32 or c in '\t\n')
-        
-        return repo_path
+    sanitize_repo_path = staticmethod(_sanitize_repo_path)
+    sanitize_commit_sha = staticmethod(_sanitize_commit_sha)
+    truncate_message = staticmethod(_truncate_message)
+
+
+# TextFormatter exposes these as static methods
+def _format_commit_short_info(sha: str, message: str, author: str) -> str:
+    """
+    Format short commit information
     
-    @staticmethod
-    def sanitize_commit_sha(sha: str) -> str:
-        """
-        Sanitize commit SHA input
-        
-        Args:
-            sha: Commit SHA
-            
-        Returns:
-            str: Sanitized SHA
-            
-        Raises:
-            ValueError: If SHA is invalid
-        """
-        if not isinstance(sha, str):
-            raise ValueError("Commit SHA must be a string")
-        
-        sha = sha.strip()
+    Args:
+        sha: Commit SHA
+        message: Commit message
+        author: Author name
         
-        if not CommitValidator.validate_commit_sha(sha):
-            raise ValueError(f"Invalid commit SHA format: {sha}")
+    Returns:
+        str: Formatted string
+    """
+    short_sha = sha[:8]
+    short_message = message.split('\n', 1)[0][:100]
+    return f"`{short_sha}` - {short_message} ({author})"
+
+
+def _format_verification_status(status: str) -> str:
+    """
+    Format verification status with emoji
+    
+    Args:
+        status: Verification status ('approved', 'rejected')
         
-        return CommitValidator.normalize_commit_sha(sha)
+    Returns:
+        str: Formatted status with emoji
+    """
+    return f"{_STATUS_EMOJI_GET(status, '❓')} {status.upper()}"
+
+
+def _format_file_change(filename: str, status: str, additions: int, deletions: int) -> str:
+    """
+    Format file change information
     
-    @staticmethod
-    def truncate_message(message: str, max_length: int = MAX_MESSAGE_LENGTH) -> str:
-        """
-        Truncate message to maximum length
+    Args:
+        filename: File name
+        status: Change status (added, modified, removed, etc.)
+        additions: Number of additions
+        deletions: Number of deletions
         
-        Args:
-            message: Message to truncate
-            max_length: Maximum length
-            
-        Returns:
-            str: Truncated message
-        """
-        if len(message) <= max_length:
-            return message
-        return message[:max_length - 3] + "..."
+    Returns:
+        str: Formatted string
+    """
+    return f"{_FILE_EMOJI_GET(status, '📄')} {filename} (+{additions}/-{deletions})"
 
 
 class TextFormatter:
@@ -266,63 +387,9 @@ class TextFormatter:
     Форматирование текста
     """
     
-    @staticmethod
-    def format_commit_short_info(sha: str, message: str, author: str) -> str:
-        """
-        Format short commit information
-        
-        Args:
-            sha: Commit SHA
-            message: Commit message
-            author: Author name
-            
-        Returns:
-            str: Formatted string
-        """
-        short_sha = sha[:8] if len(sha) >= 8 else sha
-        short_message = message.split('\n')[0][:100]
-        return f"`{short_sha}` - {short_message} ({author})"
-    
-    @staticmethod
-    def format_verification_status(status: str) -> str:
-        """
-        Format verification status with emoji
-        
-        Args:
-            status: Verification status ('approved', 'rejected')
-            
-        Returns:
-            str: Formatted status with emoji
-        """
-        emoji_map = {
-            'approved': '✅',
-            'rejected': '❌',
-        }
-        return f"{emoji_map.get(status, '❓')} {status.upper()}"
-    
-    @staticmethod
-    def format_file_change(filename: str, status: str, additions: int, deletions: int) -> str:
-        """
-        Format file change information
-        
-        Args:
-            filename: File name
-            status: Change status (added, modified, removed, etc.)
-            additions: Number of additions
-            deletions: Number of deletions
-            
-        Returns:
-            str: Formatted string
-        """
-        status_emoji = {
-            'added': '🆕',
-            'modified': '✍️',
-            'removed': '❌',
-            'renamed': '📄',
-            'copied': '📃',
-        }.get(status, '📄')
-        
-        return f"{status_emoji} {filename} (+{additions}/-{deletions})"
+    format_commit_short_info = staticmethod(_format_commit_short_info)
+    format_verification_status = staticmethod(_format_verification_status)
+    format_file_change = staticmethod(_format_file_change)
 
 
 class RateLimiter:
@@ -331,6 +398,8 @@ class RateLimiter:
     Ограничение частоты API вызовов
     """
     
+    __slots__ = ('calls_per_second', 'min_interval', 'last_call_time')
+    
     def __init__(self, calls_per_second: float = 10):
         """
         Initialize rate limiter
@@ -351,17 +420,15 @@ class RateLimiter:
             >>> await limiter.acquire()
             >>> # Make API call
         """
-        import asyncio
-        import time
-        
-        now = time.time()
+        now = monotonic()
         
         if self.last_call_time is not None:
-            elapsed = now - self.last_call_time
-            if elapsed < self.min_interval:
-                await asyncio.sleep(self.min_interval - elapsed)
+            wait = self.min_interval - (now - self.last_call_time)
+            if wait > 0:
+                await asyncio.sleep(wait)
+                now += wait
         
-        self.last_call_time = time.time()
+        self.last_call_time = now
 
 
 def mask_token(token: str, visible_chars: int = 4) -> str:
@@ -379,9 +446,10 @@ def mask_token(token: str, visible_chars: int = 4) -> str:
         >>> mask_token('github_token_abc123', 4)
         '...c123'
     """
-    if len(token) <= visible_chars:
-        return f"...{token}"
-    return f"...{token[-visible_chars:]}"
+    n = len(token)
+    if n <= visible_chars:
+        return _MASK_PREFIX + token
+    return _MASK_PREFIX + token[n - visible_chars:]
 
 
 def format_bytes(bytes_count: int) -> str:
@@ -398,11 +466,11 @@ def format_bytes(bytes_count: int) -> str:
         >>> format_bytes(1024)
         '1.0 KB'
     """
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if bytes_count < 1024:
-            return f"{bytes_count:.1f} {unit}"
-        bytes_count /= 1024
-    return f"{bytes_count:.1f} TB"
+    if bytes_count < 1024:
+        return f"{bytes_count:.1f} B"
+    # Each unit is 2**10 of the previous one
+    idx = min((int(bytes_count).bit_length() - 1) // 10, len(_BYTE_UNITS) - 1)
+    return f"{bytes_count / (1 << (idx * 10)):.1f} {_BYTE_UNITS[idx]}"
 
 
 if __name__ == '__main__':